@@ -0,0 +1,125 @@
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from BulkImport import bulk_load, result_rows
+from GaugeGeometry import gauge_at, gauge_geometry
+from GaugeSpec import DEFAULT_STYLE, STYLES, GaugeSpec
+
+def parse_amount(value):
+    amount = float(str(value).replace(",", "").replace("$", "").strip())
+    # Keep whole numbers as ints so labels match the app ("1,000" not "1,000.0")
+    if amount.is_integer():
+        return int(amount)
+    return amount
+
+def load_rows(path):
+    # Amounts are parsed and validated a column at a time; see BulkImport
+    result = bulk_load(path)
+    for error in result.errors:
+        print(f"Skipping line {error.line}: {error.column} {error.value!r}: {error.reason}", file=sys.stderr)
+    return result_rows(result)
+
+def chart_file_name(project_name, extension="png"):
+    safe_name = re.sub(r'[\\/:*?"<>|]+', "_", project_name)
+    return f"{safe_name}_progress_chart.{extension}"
+
+def chart_file_namer(extension="png"):
+    # Maps project names to file names that are unique within one batch;
+    # repeated names get _2, _3, ... instead of overwriting each other
+    seen = set()
+
+    def name_for(project_name):
+        name = chart_file_name(project_name, extension)
+        stem, suffix = os.path.splitext(name)
+        count = 1
+        while name in seen:
+            count += 1
+            name = f"{stem}_{count}{suffix}"
+        seen.add(name)
+        return name
+    return name_for
+
+def render_to_file(spec, output_dir, geometry=None, profile_name=None, file_name=None):
+    # Imported here so each worker process pays the import cost once
+    from ChartProfiles import get_profile
+    from DonationChart import render_spec_png
+
+    profile = get_profile(profile_name) if profile_name else None
+    img_buffer = render_spec_png(spec, geometry, profile)
+
+    extension = profile.format if profile else "png"
+    path = os.path.join(output_dir, file_name or chart_file_name(spec.project_name, extension))
+    with open(path, "wb") as f:
+        f.write(img_buffer.getbuffer())
+    return path
+
+def render_batch(rows, output_dir, workers=None, profile_name=None, on_rendered=None, style=DEFAULT_STYLE):
+    # rows are (project, donated, target) tuples, drawn as GaugeSpecs of
+    # the given style; on_rendered(row, path) is called for every chart
+    # written
+    from ChartProfiles import get_profile
+
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    done = 0
+    failed = 0
+
+    # Geometry for every row in one vectorized pass; workers only draw
+    geometry = gauge_geometry([row[1] for row in rows], [row[2] for row in rows])
+    extension = get_profile(profile_name).format if profile_name else "png"
+    name_for = chart_file_namer(extension)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(render_to_file, GaugeSpec(*row, style), output_dir, gauge_at(geometry, index),
+                        profile_name, name_for(row[0])): row
+            for index, row in enumerate(rows)
+        }
+        for future in as_completed(futures):
+            try:
+                path = future.result()
+            except Exception as exc:
+                failed += 1
+                print(f"Failed {futures[future][0]!r}: {exc}", file=sys.stderr)
+                continue
+            done += 1
+            if on_rendered is not None:
+                on_rendered(futures[future], path)
+            elapsed = time.perf_counter() - start
+            print(f"[{done}/{len(rows)}] {path} ({done / elapsed:.1f} charts/sec)")
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"Rendered {done} charts in {elapsed:.2f}s ({rate:.1f} charts/sec), {failed} failed")
+    return done, failed, elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render donation gauge charts in bulk.")
+    parser.add_argument("input", help="CSV or JSON file with project_name, donated_amount, target_amount")
+    parser.add_argument("-o", "--output-dir", default="charts", help="Directory for the PNG files")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--profile", default=None,
+                        help="Output profile from ChartProfiles (print, fast, palette, web, webp)")
+    parser.add_argument("--style", choices=STYLES, default=DEFAULT_STYLE, help="Gauge style from GaugeSpec")
+    args = parser.parse_args(argv)
+    if args.profile:
+        from ChartProfiles import get_profile
+        try:
+            get_profile(args.profile)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    rows = load_rows(args.input)
+    if not rows:
+        print("No valid rows to render.", file=sys.stderr)
+        return 1
+
+    _, failed, _ = render_batch(rows, args.output_dir, args.workers, args.profile, style=args.style)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+FIELDS = ("project_name", "donated_amount", "target_amount")
+
+RowError = namedtuple('RowError', [
+    'line',     # source line, see read_columns
+    'column',   # field the error is about
+    'value',    # raw value as read
+    'reason',
+])
+
+ImportResult = namedtuple('ImportResult', [
+    'project_names',    # (N,) str, valid rows only
+    'donated',          # (N,) float64
+    'target',           # (N,) float64
+    'percentage',       # (N,) float64, donated / target * 100
+    'lines',            # (N,) int, source line of each valid row
+    'errors',           # RowError per problem, sorted by line
+    'total',            # rows read, valid or not
+])
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8-sig") as f:
+        records = json.load(f)
+    columns = {field: [] for field in FIELDS}
+    for record in records:
+        if not isinstance(record, dict):
+            record = dict(zip(FIELDS, record if isinstance(record, (list, tuple)) else ()))
+        for field in FIELDS:
+            value = record.get(field)
+            columns[field].append("" if value is None else str(value))
+    columns = {field: np.asarray(values, dtype=str) for field, values in columns.items()}
+    return columns, np.arange(1, len(records) + 1)
+
+def _read_csv(path):
+    # utf-8-sig drops the byte order mark Excel puts before the header
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [field for field in FIELDS if field not in header]
+        if missing:
+            # One error for the file rather than one per row
+            raise ValueError(f"missing column{'s' if len(missing) > 1 else ''} "
+                             f"{', '.join(missing)} (header: {', '.join(header) or 'empty'})")
+        width = len(header)
+        rows, lines = [], []
+        for row in reader:
+            if not any(row):
+                continue
+            if len(row) != width:
+                row = (row + [""] * width)[:width]
+            rows.append(row)
+            lines.append(reader.line_num)
+    # One conversion for the whole table; only the columns we use become
+    # fixed-width strings, so a long notes column costs nothing extra
+    table = np.empty((len(rows), width), dtype=object)
+    if rows:
+        table[:] = rows
+    columns = {field: table[:, header.index(field)].astype(str) for field in FIELDS}
+    return columns, np.asarray(lines, dtype=int)
+
+def read_columns(path):
+    # Raw string columns plus the source line of each row: the CSV line
+    # (the header is line 1) or the JSON record number
+    if path.lower().endswith(".json"):
+        return _read_json(path)
+    return _read_csv(path)
+
+def _float_or_nan(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+def parse_amounts(values):
+    # "$1,234.50" -> 1234.5 for a whole column; anything that is not a
+    # finite number comes back as NaN
+    if not values.size:
+        return np.empty(0)
+    cleaned = np.char.strip(np.char.replace(np.char.replace(values, ",", ""), "$", ""))
+    try:
+        amounts = cleaned.astype(np.float64)
+    except ValueError:
+        # Only dirty columns pay for element-wise parsing
+        amounts = np.frompyfunc(_float_or_nan, 1, 1)(cleaned).astype(np.float64)
+    amounts[~np.isfinite(amounts)] = np.nan
+    return amounts
+
+def validate(columns, lines):
+    names = np.char.strip(columns["project_name"])
+    donated = parse_amounts(columns["donated_amount"])
+    target = parse_amounts(columns["target_amount"])
+
+    checks = [
+        ("project_name", names == "", "missing project name"),
+        ("donated_amount", np.isnan(donated), "not a number"),
+        ("donated_amount", donated < 0, "negative amount"),
+        ("target_amount", np.isnan(target), "not a number"),
+        ("target_amount", target <= 0, "target must be greater than zero"),
+    ]
+    valid = np.ones(len(names), dtype=bool)
+    errors = []
+    for column, failed, reason in checks:
+        valid &= ~failed
+        for index in np.flatnonzero(failed):
+            errors.append(RowError(int(lines[index]), column, str(columns[column][index]), reason))
+    errors.sort(key=lambda error: error.line)
+
+    donated, target = donated[valid], target[valid]
+    return ImportResult(
+        project_names=names[valid],
+        donated=donated,
+        target=target,
+        percentage=donated / target * 100,
+        lines=lines[valid],
+        errors=errors,
+        total=len(names),
+    )
+
+def bulk_load(path):
+    return validate(*read_columns(path))
+
+def result_rows(result):
+    # (project, donated, target) tuples for the renderers; whole amounts
+    # become ints so labels read "1,000" rather than "1,000.0"
+    def amounts(values):
+        whole = np.equal(np.mod(values, 1), 0)
+        return [int(value) if is_whole else value
+                for value, is_whole in zip(values.tolist(), whole.tolist())]
+    return list(zip(result.project_names.tolist(), amounts(result.donated), amounts(result.target)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a projects file and report rejected rows.")
+    parser.add_argument("input", help="CSV or JSON file with project_name, donated_amount, target_amount")
+    parser.add_argument("--errors", help="Write rejected rows to this CSV file")
+    parser.add_argument("--render", metavar="DIR", help="Render the valid rows into this directory")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes for --render")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        result = bulk_load(args.input)
+    except ValueError as exc:
+        print(f"Cannot read {args.input}: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    print(f"Read {result.total} rows in {elapsed:.2f}s: {len(result.project_names)} valid, "
+          f"{len({error.line for error in result.errors})} rejected", file=sys.stderr)
+
+    if args.errors:
+        with open(args.errors, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(RowError._fields)
+            writer.writerows(result.errors)
+    else:
+        for error in result.errors[:20]:
+            print(f"line {error.line}: {error.column} {error.value!r}: {error.reason}", file=sys.stderr)
+        if len(result.errors) > 20:
+            print(f"... {len(result.errors) - 20} more (use --errors to save them all)", file=sys.stderr)
+
+    if args.render and len(result.project_names):
+        from BatchChart import render_batch
+        render_batch(result_rows(result), args.render, args.workers)
+    return 1 if result.errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
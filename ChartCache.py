@@ -0,0 +1,202 @@
+import hashlib
+import numbers
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from functools import lru_cache
+
+# Bump whenever the rendered output changes, so cached images and ETags
+# keyed on it are invalidated. Kept here rather than next to the drawing
+# code so computing a key never imports numpy.
+STYLE_VERSION = 3
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+# Room for a few 300 dpi rasters (about 35 MB each) in the raster cache
+DEFAULT_MAX_RASTER_BYTES = 128 * 1024 * 1024
+# Disk tier is pruned once every this many writes, not on every put
+PRUNE_EVERY = 100
+
+def _amount(value):
+    # 500, 500.0 and "500" from different callers must share a key. Whole
+    # numbers stay exact: 10**17 and 10**17 + 1 round to the same float,
+    # but their labels differ.
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, str):
+        value = Decimal(value.strip())
+        if value == value.to_integral_value():
+            return int(value)
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def chart_key(kind, project_name, donated_amount, target_amount, dpi):
+    key = (f"{STYLE_VERSION}|{kind}|{dpi}|{project_name}|"
+           f"{_amount(donated_amount)}|{_amount(target_amount)}")
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def _size(data):
+    # Bytes of an encoded chart or of a NumPy raster
+    return data.nbytes if hasattr(data, "nbytes") else len(data)
+
+
+class ChartCache:
+    # Rendered chart bytes in two tiers: a size-bounded LRU in memory, and
+    # optionally a directory of files named by key that several processes
+    # on the same host can share. Writes go through a temporary file and
+    # os.replace, so readers never see a partial chart.
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["disk_hits"] += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._remember(key, data)
+        if self.disk_dir:
+            self._write_disk(key, data)
+
+    def get_or_render(self, key, render):
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            lookups = sum(self.counters[name] for name in ("memory_hits", "disk_hits", "misses"))
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            return {
+                **self.counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_dir": self.disk_dir,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, key, data):
+        # Caller holds the lock
+        if _size(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= _size(previous)
+        self._entries[key] = data
+        self._bytes += _size(data)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _size(evicted)
+            self.counters["evictions"] += 1
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            # mtime doubles as last use for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key, data):
+        directory = os.path.dirname(self._path(key))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            # The disk tier is best effort; a full or read-only disk only costs hits
+            return
+        with self._lock:
+            self._disk_writes += 1
+            due = self.max_disk_bytes and self._disk_writes % PRUNE_EVERY == 0
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self):
+        if not self.disk_dir or not self.max_disk_bytes:
+            return 0
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                files.append((info.st_mtime, info.st_size, path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+@lru_cache(maxsize=None)
+def shared_cache():
+    # One cache per process, configured from the environment:
+    # GAUGE_CACHE_DIR enables the disk tier, GAUGE_CACHE_MB sizes memory
+    # and GAUGE_CACHE_DISK_MB bounds the directory
+    megabytes = float(os.environ.get("GAUGE_CACHE_MB", DEFAULT_MAX_BYTES / 1024 / 1024))
+    disk_megabytes = float(os.environ.get("GAUGE_CACHE_DISK_MB", DEFAULT_MAX_DISK_BYTES / 1024 / 1024))
+    return ChartCache(int(megabytes * 1024 * 1024), os.environ.get("GAUGE_CACHE_DIR") or None,
+                      int(disk_megabytes * 1024 * 1024))
+
+@lru_cache(maxsize=None)
+def shared_raster_cache():
+    # Memory-only cache of the 300 dpi RGBA rasters behind previews, so a
+    # download right after its preview is encoded instead of rendered
+    # again. GAUGE_RASTER_CACHE_MB sizes it, 0 turns reuse off.
+    megabytes = float(os.environ.get("GAUGE_RASTER_CACHE_MB", DEFAULT_MAX_RASTER_BYTES / 1024 / 1024))
+    return ChartCache(int(megabytes * 1024 * 1024))
@@ -0,0 +1,122 @@
+import argparse
+import sys
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from BatchChart import chart_file_namer, load_rows
+from GaugeSpec import GaugeSpec
+
+FORMATS = ("zip", "tar", "tar.gz")
+
+def render_chart(spec, profile_name=None):
+    # Imported here so each worker process pays the import cost once
+    from ChartProfiles import get_profile
+    from DonationChart import render_spec_png
+
+    profile = get_profile(profile_name) if profile_name else None
+    return render_spec_png(spec, profile=profile).getvalue()
+
+def iter_charts(rows, profile_name=None, workers=1, mp_context=None):
+    # Yields (file name, chart bytes) in input order; rows are
+    # (project, donated, target) tuples or GaugeSpecs. With workers > 1 at
+    # most two charts per worker are rendered ahead of the consumer, so
+    # memory stays bounded however many rows there are.
+    from ChartProfiles import get_profile
+
+    extension = get_profile(profile_name).format if profile_name else "png"
+    name_for = chart_file_namer(extension)
+
+    specs = (GaugeSpec(*row) for row in rows)
+    if workers <= 1:
+        for spec in specs:
+            yield name_for(spec.project_name), render_chart(spec, profile_name)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        pending = deque()
+        for spec in specs:
+            pending.append((spec.project_name, pool.submit(render_chart, spec, profile_name)))
+            if len(pending) >= workers * 2:
+                project_name, future = pending.popleft()
+                yield name_for(project_name), future.result()
+        while pending:
+            project_name, future = pending.popleft()
+            yield name_for(project_name), future.result()
+
+def write_archive(charts, output, archive_format="zip"):
+    # Streams charts into an archive on a file object, which may be a pipe:
+    # zipfile falls back to data descriptors when it cannot seek, and
+    # tarfile's "w|" modes never seek
+    count = 0
+    if archive_format == "zip":
+        # PNG and WebP are already compressed; deflating them again only costs CPU
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, data in charts:
+                archive.writestr(zipfile.ZipInfo(name, date_time=time.localtime()[:6]), data)
+                count += 1
+        return count
+
+    mode = "w|gz" if archive_format == "tar.gz" else "w|"
+    with tarfile.open(fileobj=output, mode=mode) as archive:
+        for name, data in charts:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = time.time()
+            archive.addfile(info, _Reader(data))
+            count += 1
+    return count
+
+
+class _Reader:
+    # Minimal file object over one chart's bytes for tarfile.addfile
+
+    def __init__(self, data):
+        self._data = memoryview(data)
+        self._position = 0
+
+    def read(self, size=-1):
+        end = len(self._data) if size is None or size < 0 else self._position + size
+        chunk = self._data[self._position:end]
+        self._position += len(chunk)
+        return bytes(chunk)
+
+def archive_format_for(path):
+    for archive_format in sorted(FORMATS, key=len, reverse=True):
+        if path.lower().endswith("." + archive_format):
+            return archive_format
+    if path.lower().endswith(".tgz"):
+        return "tar.gz"
+    return "zip"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export every project's chart into one ZIP or TAR archive.")
+    parser.add_argument("input", help="CSV or JSON file with project_name, donated_amount, target_amount")
+    parser.add_argument("-o", "--output", default="charts.zip",
+                        help="Archive path (.zip, .tar, .tar.gz/.tgz), or - for stdout")
+    parser.add_argument("--format", choices=FORMATS, help="Archive format (default: from the output name)")
+    parser.add_argument("--profile", default=None, help="Output profile from ChartProfiles")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Render processes")
+    args = parser.parse_args(argv)
+
+    rows = load_rows(args.input)
+    if not rows:
+        print("No valid rows to export.", file=sys.stderr)
+        return 1
+
+    archive_format = args.format or archive_format_for(args.output)
+    start = time.perf_counter()
+    charts = iter_charts(rows, args.profile, args.workers)
+    if args.output == "-":
+        count = write_archive(charts, sys.stdout.buffer, archive_format)
+    else:
+        with open(args.output, "wb") as f:
+            count = write_archive(charts, f, archive_format)
+    elapsed = time.perf_counter() - start
+    print(f"Exported {count} charts in {elapsed:.2f}s ({count / elapsed:.1f} charts/sec)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
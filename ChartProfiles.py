@@ -0,0 +1,104 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import namedtuple
+from io import BytesIO
+
+OutputProfile = namedtuple('OutputProfile', [
+    'format',           # 'png' or 'webp'
+    'dpi',              # render resolution
+    'max_width',        # pixels; lowers the dpi when the chart would be wider
+    'colors',           # palette size for PNG, None keeps full RGBA
+    'compress_level',   # zlib level for PNG, 0-9
+    'lossless',         # WebP only
+    'quality',          # WebP only, 0-100
+])
+
+# The chart is a handful of flat colours plus anti-aliased edges, so a
+# small palette is visually lossless and several times smaller
+PROFILES = {
+    'print': OutputProfile('png', 300, None, None, 6, False, None),
+    'fast': OutputProfile('png', 300, None, None, 1, False, None),
+    'palette': OutputProfile('png', 300, None, 32, 6, False, None),
+    'web': OutputProfile('png', 300, 1600, 32, 6, False, None),
+    'webp': OutputProfile('webp', 300, 1600, None, None, True, 50),
+}
+DEFAULT_PROFILE = 'print'
+
+MIME_TYPES = {'png': 'image/png', 'webp': 'image/webp'}
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown output profile {name!r}, expected one of {', '.join(PROFILES)}") from None
+
+def profile_dpi(profile, width_inches=12):
+    if profile.max_width:
+        return min(profile.dpi, int(profile.max_width / width_inches))
+    return profile.dpi
+
+def encode_image(rgba, profile, dpi=None):
+    from PIL import Image
+
+    image = Image.fromarray(rgba, 'RGBA')
+    dpi = dpi or profile.dpi
+    output = BytesIO()
+    if profile.format == 'webp':
+        image.save(output, 'WEBP', lossless=profile.lossless, quality=profile.quality, method=1)
+    else:
+        if profile.colors:
+            image = image.quantize(profile.colors, method=Image.Quantize.FASTOCTREE)
+        image.save(output, 'PNG', compress_level=profile.compress_level, dpi=(dpi, dpi))
+    return output.getvalue()
+
+def profile_report(cases, profiles=PROFILES, repeat=5):
+    # Render time, encode time and size of every profile over the cases
+    from DonationChart import gauge_chart, render_chart_rgba
+
+    report = {}
+    for name, profile in profiles.items():
+        render_ms, encode_ms, sizes = [], [], []
+        for case in cases:
+            for _ in range(repeat):
+                with gauge_chart(*case) as fig:
+                    dpi = profile_dpi(profile, fig.get_figwidth())
+                    start = time.perf_counter()
+                    rgba = render_chart_rgba(fig, dpi=dpi)
+                    render_ms.append((time.perf_counter() - start) * 1000)
+                start = time.perf_counter()
+                data = encode_image(rgba, profile, dpi)
+                encode_ms.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(data))
+        report[name] = {
+            'format': profile.format,
+            'pixels': f"{rgba.shape[1]}x{rgba.shape[0]}",
+            'render_ms': round(statistics.median(render_ms), 1),
+            'encode_ms': round(statistics.median(encode_ms), 1),
+            'bytes': round(statistics.fmean(sizes)),
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure encode time and size of each chart output profile.")
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    from GaugeBenchmark import CASES
+
+    report = profile_report(list(CASES.values()), repeat=args.repeat)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    baseline = report[DEFAULT_PROFILE]
+    print(f"{'profile':<10}{'format':<8}{'pixels':<12}{'render ms':>10}{'encode ms':>11}{'bytes':>10}{'size':>8}")
+    for name, row in report.items():
+        print(f"{name:<10}{row['format']:<8}{row['pixels']:<12}{row['render_ms']:>10.1f}"
+              f"{row['encode_ms']:>11.1f}{row['bytes']:>10}{row['bytes'] / baseline['bytes']:>8.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,109 +1,22 @@
-import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
+import os
+import threading
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
 from io import BytesIO
-import textwrap
-
-def create_gauge_chart(project_name, donated_amount, target_amount):
-    fig, ax = plt.subplots(figsize=(12, 8), subplot_kw={'aspect': 'equal'})
-    
-    # Set Garamond font for matplotlib
-    plt.rcParams['font.family'] = 'serif'
-    plt.rcParams['font.serif'] = ['Garamond']
-    plt.rcParams['font.weight'] = 'bold'
-    
-    # Calculate percentages
-    actual_percentage = donated_amount / target_amount
-    visual_percentage = min(actual_percentage, 1.0)
-
-    # Draw gauge background (red arc)
-    start_angle = 180
-    end_angle = start_angle - 180
-    theta = np.linspace(start_angle, end_angle, 100)
-    ax.plot(np.cos(np.radians(theta)), np.sin(np.radians(theta)), color='red', lw=30)
-
-    # Draw progress (green arc)
-    progress_end_angle = start_angle - (visual_percentage * 180)
-    theta_progress = np.linspace(start_angle, progress_end_angle, 100)
-    ax.plot(np.cos(np.radians(theta_progress)), np.sin(np.radians(theta_progress)), color='green', lw=30)
-
-    # Needle positioning
-    if donated_amount == 0:
-        needle_angle = start_angle + (0.03 * 180)
-    else:
-        if actual_percentage == 0.5:
-            needle_angle = start_angle - 90
-        else:
-            needle_angle = progress_end_angle - 4.7
-
-    # Draw needle (corrected syntax)
-    needle_length = 0.92
-    needle_width = 0.06
-    needle_tip = (
-        needle_length * np.cos(np.radians(needle_angle)),
-        needle_length * np.sin(np.radians(needle_angle))
-    )
-    needle_base_left = (
-        needle_width * np.cos(np.radians(needle_angle + 90)),
-        needle_width * np.sin(np.radians(needle_angle + 90))
-    )
-    needle_base_right = (
-        needle_width * np.cos(np.radians(needle_angle - 90)),
-        needle_width * np.sin(np.radians(needle_angle - 90))
-    )
-    
-    needle = plt.Polygon(
-        [needle_tip, needle_base_left, needle_base_right],
-        closed=True, color='black', zorder=3
-    )
-    ax.add_patch(needle)
-
-    # Draw pivot
-    pivot_circle = plt.Circle((0, 0), 0.06, color='black', zorder=5)
-    ax.add_artist(pivot_circle)
-    inner_circle = plt.Circle((0, 0), 0.03, color='white', zorder=6)
-    ax.add_artist(inner_circle)
-
-    # Draw needle base
-    base_radius = 0.02
-    base_angle = np.linspace(needle_angle - 90, needle_angle + 90, 100)
-    base_x = base_radius * np.cos(np.radians(base_angle))
-    base_y = base_radius * np.sin(np.radians(base_angle))
-    ax.plot(base_x, base_y, color='black', lw=2, zorder=4)
-
-    # Format amounts
-    donated_amount_formatted = f"{donated_amount:,}"
-    target_amount_formatted = f"{target_amount:,}"
-
-    # Adjusted label positions
-    ax.text(-1, -0.19, f'Donated: ${donated_amount_formatted}', 
-            horizontalalignment='center', fontsize=15, fontweight='bold', color='black')
-    ax.text(1, -0.19, f'Target: ${target_amount_formatted}', 
-            horizontalalignment='center', fontsize=15, fontweight='bold', color='black')
-
-    progress_percentage = round(actual_percentage * 100)
-    ax.text(0, -0.4, f'Progress: {progress_percentage}%', 
-            horizontalalignment='center', fontsize=26, fontweight='bold', color='black')
-
-    # Project title
-    wrapped_project_name = textwrap.fill(project_name, width=20)
-    plt.title(wrapped_project_name, fontsize=30, fontweight='bold', 
-             pad=20, ha='center', va='center', multialignment='center')
-
-    ax.set_xlim(-1.2, 1.2)
-    ax.set_ylim(-1.2, 1.2)
-    ax.axis('off')
-
-    return fig
-
-def get_chart_image(fig):
-    img_buffer = BytesIO()
-    fig.savefig(img_buffer, format="png", dpi=300, transparent=True)
-    img_buffer.seek(0)
-    return img_buffer
 
-def main():
-    st.markdown("""
+from ChartCache import shared_cache, shared_raster_cache
+from ChartProfiles import MIME_TYPES, encode_image, get_profile, profile_dpi
+from GaugeSpec import GaugeSpec, spec_figure
+from RenderScheduler import Busy, shared_scheduler
+from RenderStats import RingBufferSink, add_sink, render_trace, stage
+
+# Pin the non-interactive backend before anything imports matplotlib
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# streamlit, matplotlib and numpy are imported on first use, so batch jobs,
+# workers and fresh replicas don't pay for them at module load
+
+PAGE_CSS = """
         <style>
             /* Garamond font for all elements */
             body, .stTextInput > div > input, .stNumberInput > div > input,
@@ -148,10 +61,190 @@ def main():
                 box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
             }
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+# Render in the background and poll for the result (CHART_ASYNC=0 blocks
+# the script instead). A synchronous click waits up to QUEUE_TIMEOUT seconds
+# for room in a full render queue; an asynchronous one is refused at once.
+ASYNC_RENDER = os.environ.get("CHART_ASYNC", "1") != "0"
+QUEUE_TIMEOUT = 10
+POLL_INTERVAL = 0.25
+
+# Output profile for the download button, see ChartProfiles.PROFILES
+DOWNLOAD_PROFILE = os.environ.get("CHART_PROFILE", "print")
+
+# The in-app export renders at most EXPORT_MAX_ROWS charts with the small
+# web profile (about 17 KB a chart); larger files go through ChartExport.py
+EXPORT_PROFILE = "web"
+EXPORT_MAX_ROWS = 1000
+EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+EXPORT_MAX_ERRORS_SHOWN = 200
+
+# Debug panel with the last render breakdowns and cache counters. The
+# traces are process-wide (every session's renders, project names
+# included), so only the operator can switch it on, never a URL parameter.
+DEBUG = os.environ.get("CHART_DEBUG") == "1"
+
+def debug_traces():
+    return RingBufferSink(size=20)
+
+def create_gauge_chart(project_name, donated_amount, target_amount, geometry=None):
+    return spec_figure(GaugeSpec(project_name, donated_amount, target_amount), geometry)
+
+def get_chart_image(fig, profile=None):
+    if profile is not None:
+        dpi = profile_dpi(profile, fig.get_figwidth())
+        rgba = render_chart_rgba(fig, dpi=dpi)
+        with stage("encode"):
+            return BytesIO(encode_image(rgba, profile, dpi))
+
+    img_buffer = BytesIO()
+    with stage("savefig"):
+        fig.savefig(img_buffer, format="png", dpi=300, transparent=True)
+    img_buffer.seek(0)
+    return img_buffer
+
+@contextmanager
+def spec_chart(spec, geometry=None):
+    if geometry is None:
+        from GaugeGeometry import single_geometry
+        with stage("geometry"):
+            geometry = single_geometry(spec.donated_amount, spec.target_amount)
+    with stage("artists"):
+        fig = spec_figure(spec, geometry)
+    try:
+        yield fig
+    finally:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        # Drop the artists and the cached Agg renderer (a full-size pixel
+        # buffer) right away instead of waiting for the cycle collector
+        fig.clear()
+        FigureCanvasAgg(fig)
+
+def gauge_chart(project_name, donated_amount, target_amount, geometry=None):
+    return spec_chart(GaugeSpec(project_name, donated_amount, target_amount), geometry)
+
+def render_spec_png(spec, geometry=None, profile=None):
+    with render_trace("render_gauge_png", project=spec.project_name), spec_chart(spec, geometry) as fig:
+        return get_chart_image(fig, profile)
+
+def render_gauge_png(project_name, donated_amount, target_amount, geometry=None, profile=None):
+    return render_spec_png(GaugeSpec(project_name, donated_amount, target_amount), geometry, profile)
+
+def render_spec_rgba(spec, dpi=300):
+    with spec_chart(spec) as fig:
+        return render_chart_rgba(fig, dpi)
+
+def render_gauge_rgba(project_name, donated_amount, target_amount, dpi=300):
+    return render_spec_rgba(GaugeSpec(project_name, donated_amount, target_amount), dpi)
+
+def render_preview(spec):
+    with render_trace("chart", project=spec.project_name):
+        rgba = render_spec_rgba(spec)
+        preview = encode_png(preview_image(rgba), dpi=100).getvalue()
+    # The raster stays in the process-wide raster cache for the download
+    shared_raster_cache().put(spec.key("rgba"), rgba)
+    return preview
+
+def render_download(spec, profile_name=DOWNLOAD_PROFILE):
+    # Profiles at 300 dpi reuse the preview's raster while it is cached
+    profile = get_profile(profile_name)
+    dpi = profile_dpi(profile)
+    with render_trace("download", project=spec.project_name, profile=profile_name):
+        rgba = shared_raster_cache().get(spec.key("rgba", dpi))
+        if rgba is None:
+            rgba = render_spec_rgba(spec, dpi)
+        with stage("encode"):
+            return encode_image(rgba, profile, dpi)
+
+def render_chart_rgba(fig, dpi=300):
+    import numpy as np
+    # Rasterize once to a raw RGBA array; preview and download both come from it
+    raw_buffer = BytesIO()
+    with stage("rasterize"):
+        fig.savefig(raw_buffer, format="rgba", dpi=dpi, transparent=True)
+    width, height = (fig.get_size_inches() * dpi).astype(int)
+    return np.frombuffer(raw_buffer.getbuffer(), dtype=np.uint8).reshape(height, width, 4)
+
+def preview_image(rgba, factor=3):
+    with stage("preview"):
+        return _downsample(rgba, factor)
+
+def _downsample(rgba, factor):
+    import numpy as np
+    # Crop to the drawn area, like st.pyplot's tight bbox
+    rows = np.flatnonzero(rgba[..., 3].any(axis=1))
+    cols = np.flatnonzero(rgba[..., 3].any(axis=0))
+    if len(rows) and len(cols):
+        rgba = rgba[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+    # Downsample by averaging factor x factor blocks with premultiplied alpha
+    height = rgba.shape[0] // factor * factor
+    width = rgba.shape[1] // factor * factor
+    alpha = rgba[:height, :width, 3:].astype(np.uint32)
+    premultiplied = rgba[:height, :width, :3] * alpha
+    blocks = [(i, j) for i in range(factor) for j in range(factor)]
+    color = sum(premultiplied[i::factor, j::factor] for i, j in blocks)
+    total_alpha = sum(alpha[i::factor, j::factor] for i, j in blocks)
+
+    preview = np.empty(color.shape[:2] + (4,), dtype=np.uint8)
+    preview[..., :3] = np.floor_divide(color, total_alpha, out=np.zeros_like(color), where=total_alpha > 0)
+    preview[..., 3:] = total_alpha // len(blocks)
+    return preview
+
+def encode_png(rgba, dpi=300):
+    from matplotlib.image import imsave
+    img_buffer = BytesIO()
+    with stage("encode"):
+        imsave(img_buffer, rgba, format="png", dpi=dpi)
+    img_buffer.seek(0)
+    return img_buffer
+
+def _warm_up():
+    # Loads matplotlib, resolves fonts and fills the geometry caches
+    with gauge_chart("warm-up", 1, 2) as fig:
+        fig.canvas.draw()
+
+def prewarm():
+    thread = threading.Thread(target=_warm_up, name="chart-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+def main():
+    import streamlit as st
+
+    # Streamlit re-executes this script on every rerun, so a module global
+    # can't guard the warm-up; cache_resource starts it once per process
+    st.cache_resource(prewarm, show_spinner=False)()
+    debug = DEBUG
+    if debug:
+        # Streamlit re-executes this script on every rerun; cache_resource
+        # keeps one buffer per process instead of a new sink per rerun
+        traces = st.cache_resource(debug_traces)()
+        add_sink(traces)
+
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
     st.markdown("<h2 style='text-align: center;'>Project Donation Tracker</h2>", unsafe_allow_html=True)
 
+    # Widgets inside a fragment rerun only that fragment, so typing in the
+    # form or picking an archive format leaves the CSS, header and the
+    # other section alone
+    cache, scheduler = shared_cache(), shared_scheduler()
+    st.fragment(chart_panel)(st, cache, scheduler, debug)
+
+    st.fragment(show_bulk_export)(st)
+
+    if debug:
+        show_render_timings(st, traces)
+        stats = shared_cache().stats()
+        st.caption(f"Chart cache: {stats['memory_hits']} memory hits, {stats['disk_hits']} disk hits, "
+                   f"{stats['misses']} misses, {stats['bytes'] // 1024} KiB")
+        stats = shared_scheduler().stats()
+        st.caption(f"Render queue: {stats['pending']} pending, {stats['coalesced']} coalesced, "
+                   f"{stats['rejected']} rejected, {stats['cancelled']} cancelled")
+
+def chart_panel(st, cache, scheduler, debug=False):
     project_name = st.text_input("Enter the project name:")
     donated_amount = st.number_input("Enter the donated amount:", min_value=0, step=1)
     target_amount = st.number_input("Enter the target amount:", min_value=0, step=1)
@@ -159,20 +252,209 @@ def main():
     if target_amount == 0:
         st.warning("Target amount cannot be zero!")
 
+    # The render runs on the shared scheduler and the session keeps the last
+    # spec with its Future; a placeholder polls until it is done, so the
+    # script never blocks on matplotlib (unless CHART_ASYNC=0). A finished
+    # chart stays in the session, so reruns and clicks with the same inputs
+    # show it again instead of rendering it again.
+    memo = st.session_state.setdefault("render_memo", {"requested": 0, "avoided": 0})
+    spec = GaugeSpec(project_name, donated_amount, target_amount)
+    render = st.session_state.get("render")
+    if render is not None and render[1].cancelled():
+        render = st.session_state["render"] = None
+    if render is not None and render[0] != spec and not render[1].done():
+        # New input made the pending chart stale
+        scheduler.cancel(render[0].key("preview"), render[1])
+        render = st.session_state["render"] = None
+
     if st.button("Generate Chart"):
         if project_name and target_amount > 0:
-            fig = create_gauge_chart(project_name, donated_amount, target_amount)
-            st.pyplot(fig)
-            img_buffer = get_chart_image(fig)
-            st.download_button(
-                label="Download Chart Image",
-                data=img_buffer,
-                file_name=f"{project_name}_progress_chart.png",
-                mime="image/png"
-            )
+            # The same inputs as the last chart just show it again below
+            if render is None or render[0] != spec or render_error(render[1]) is not None:
+                try:
+                    render = st.session_state["render"] = (spec, submit_preview(cache, scheduler, spec))
+                    memo["requested"] += 1
+                except Busy:
+                    st.warning("Charts are in high demand right now, please try again in a moment.")
         else:
             st.warning("Please ensure that all fields are filled out correctly.")
 
+    error = render_error(render[1]) if render is not None else None
+    if error is not None:
+        # A failed render is reported once and forgotten, so the next click
+        # tries again
+        if render[0] == spec:
+            st.error(f"Could not render the chart: {error}")
+        render = st.session_state["render"] = None
+
+    if render is not None and render[0] == spec:
+        if not render[1].done():
+            st.fragment(wait_for_chart, run_every=POLL_INTERVAL)(st, render[1])
+        else:
+            if st.session_state.get("shown") is render[1]:
+                # A rerun or repeat click with the chart already on screen
+                memo["avoided"] += 1
+            st.session_state["shown"] = render[1]
+            show_chart(st, cache, scheduler, spec, render[1].result())
+
+    if debug:
+        st.caption(f"Chart renders: {memo['requested']} requested, {memo['avoided']} avoided")
+
+def render_error(future):
+    # Exception of a finished render, None while pending or after success
+    if future.done() and not future.cancelled():
+        return future.exception()
+    return None
+
+def submit_preview(cache, scheduler, spec):
+    # Unchanged totals come straight from the chart cache; sessions asking
+    # for the same chart at once share a single render
+    key = spec.key("preview")
+    preview = cache.get(key)
+    if preview is not None:
+        future = Future()
+        future.set_result(preview)
+        return future
+    if not ASYNC_RENDER:
+        future = scheduler.submit(key, cache_preview, key, spec, timeout=QUEUE_TIMEOUT)
+        wait([future])
+        return future
+    return scheduler.submit(key, cache_preview, key, spec)
+
+def cache_preview(key, spec):
+    # Only the preview bytes leave the job: the Future is kept in session
+    # state, the 300 dpi raster in the bounded raster cache
+    preview = render_preview(spec)
+    shared_cache().put(key, preview)
+    return preview
+
+def wait_for_chart(st, future):
+    # Fragment rerun every POLL_INTERVAL; swaps in the chart with a full rerun
+    if future.done():
+        st.rerun()
+    st.info("Rendering chart...")
+
+def show_chart(st, cache, scheduler, spec, preview):
+    profile = get_profile(DOWNLOAD_PROFILE)
+    download_key = spec.key(f"download-{DOWNLOAD_PROFILE}", profile_dpi(profile))
+    st.image(preview, width="stretch")
+
+    # The download is rendered and encoded only when requested, then
+    # served from the chart cache
+    def download():
+        return cache.get_or_render(download_key, lambda: scheduler.run(
+            download_key, render_download, spec, timeout=QUEUE_TIMEOUT))
+
+    st.download_button(
+        label="Download Chart Image",
+        data=download,
+        file_name=f"{spec.project_name}_progress_chart.{profile.format}",
+        mime=MIME_TYPES[profile.format]
+    )
+
+def show_bulk_export(st):
+    from BulkImport import result_rows
+
+    with st.expander("Export all charts"):
+        uploaded = st.file_uploader("Projects file with project_name, donated_amount, target_amount",
+                                    type=["csv", "json"])
+        archive_format = st.radio("Archive format", ["zip", "tar.gz"], horizontal=True)
+        if uploaded is None:
+            st.session_state.pop("export", None)
+            return
+
+        try:
+            result = load_upload(uploaded.name, uploaded.getvalue())
+        except ValueError as exc:
+            st.error(f"Could not read {uploaded.name}: {exc}")
+            return
+        if result.errors:
+            show_rejected_rows(st, result)
+
+        count = len(result.project_names)
+        if not count:
+            st.warning("No valid rows to export.")
+            return
+        if count > EXPORT_MAX_ROWS:
+            st.warning(f"{count:,} charts are more than the app exports at once ({EXPORT_MAX_ROWS:,}). "
+                       f"Export them from the command line instead:")
+            st.code(f"python ChartExport.py {uploaded.name} -o project_charts.{archive_format} --profile web -j 4",
+                    language="bash")
+            return
+
+        # The finished archive is kept for the download button, so switching
+        # formats or clicking download doesn't render everything again
+        export_id = (uploaded.file_id, archive_format)
+        export = st.session_state.get("export")
+        if export is None or export[0] != export_id:
+            if not st.button("Render All Charts"):
+                return
+            progress = st.progress(0.0, text="Rendering charts...")
+            data = export_archive(result_rows(result), archive_format, progress.progress)
+            progress.empty()
+            export = st.session_state["export"] = (export_id, data)
+
+        st.download_button(
+            label="Download All Charts",
+            data=export[1],
+            file_name=f"project_charts.{archive_format}",
+            mime="application/zip" if archive_format == "zip" else "application/gzip"
+        )
+
+def load_upload(file_name, data):
+    # BulkImport reads from a path and picks the parser by extension
+    import tempfile
+    from BulkImport import bulk_load
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, os.path.basename(file_name))
+        with open(path, "wb") as f:
+            f.write(data)
+        return bulk_load(path)
+
+def show_rejected_rows(st, result):
+    rejected = len({error.line for error in result.errors})
+    st.warning(f"{rejected:,} of {result.total:,} rows were rejected and are left out of the export.")
+    shown = result.errors[:EXPORT_MAX_ERRORS_SHOWN]
+    st.dataframe([error._asdict() for error in shown], hide_index=True)
+    if len(result.errors) > len(shown):
+        st.caption(f"... {len(result.errors) - len(shown):,} more problems "
+                   f"(python BulkImport.py FILE --errors rejected.csv lists them all)")
+
+def export_archive(rows, archive_format, on_progress=None):
+    # Renders on EXPORT_WORKERS processes. The rows are capped at
+    # EXPORT_MAX_ROWS, so the archive is built in memory.
+    import multiprocessing
+    from ChartExport import iter_charts, write_archive
+
+    # Spawned workers: forking the Streamlit server with its threads
+    # running could copy a held lock into the child
+    context = multiprocessing.get_context("spawn")
+
+    def charts():
+        for done, chart in enumerate(iter_charts(rows, EXPORT_PROFILE, EXPORT_WORKERS, context), 1):
+            if on_progress is not None:
+                on_progress(done / len(rows), text=f"Rendered {done:,} of {len(rows):,} charts")
+            yield chart
+
+    output = BytesIO()
+    write_archive(charts(), output, archive_format)
+    return output.getvalue()
+
+def show_render_timings(st, sink):
+    traces = sink.records()
+    with st.expander(f"Render timings (last {len(traces)})"):
+        rows = []
+        for trace in reversed(traces):
+            row = {"render": trace["label"], "project": trace.get("project", ""),
+                   "total ms": trace["total_ms"]}
+            row.update({f"{record['stage']} ms": record["ms"] for record in trace["stages"]})
+            rows.append(row)
+        if rows:
+            st.table(rows)
+        else:
+            st.write("No renders yet.")
+
 if __name__ == "__main__":
     main()
 
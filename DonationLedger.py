@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from BatchChart import parse_amount, render_batch, render_to_file
+from GaugeSpec import GaugeSpec
+
+def _add(total, amount):
+    # Round to cents so float donations don't drift into labels like
+    # "30.299999999999997", and keep whole totals as ints
+    total = round(total + amount, 2)
+    return int(total) if float(total).is_integer() else total
+
+def progress_label(donated_amount, target_amount):
+    # Same rounding as GaugeGeometry (round half to even)
+    return int(round(donated_amount / target_amount * 100))
+
+def visible_state(donated_amount, target_amount):
+    # Everything a gauge shows that depends on the amounts; equal states
+    # render identical charts
+    return (progress_label(donated_amount, target_amount),
+            f"{donated_amount:,}", f"{target_amount:,}")
+
+
+class DonationLedger:
+    # Running totals per project, fed by an append-only log of JSON lines:
+    #   {"project": "Roof", "amount": 25, "time": 1700000000.0}
+    #   {"project": "Roof", "target": 1000}
+    # Each event costs O(1). The log can be replayed from the start and
+    # followed while other processes append to it. The ledger remembers
+    # what each gauge showed when last rendered, so only projects whose
+    # progress percentage or amount labels changed are rendered again.
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self.donated = {}
+        self.targets = {}
+        self.events = 0
+        self._offset = 0
+        self._rendered = {}
+
+    @classmethod
+    def replay(cls, log_path):
+        ledger = cls(log_path)
+        ledger.catch_up()
+        return ledger
+
+    def record(self, project_name, amount=0, target=None):
+        event = {"project": project_name}
+        if target is not None:
+            event["target"] = parse_amount(target)
+        amount = parse_amount(amount)
+        if amount:
+            event["amount"] = amount
+            event["time"] = time.time()
+        if not self.log_path:
+            self.apply(event)
+            return event
+        # Applied by reading it back, in log order with any lines other
+        # writers appended meanwhile
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+        self.catch_up()
+        return event
+
+    def apply(self, event):
+        project_name = event["project"]
+        if "target" in event:
+            self.targets[project_name] = parse_amount(event["target"])
+        amount = event.get("amount", 0)
+        if not isinstance(amount, (int, float)):
+            amount = parse_amount(amount)
+        self.donated[project_name] = _add(self.donated.get(project_name, 0), amount)
+        self.events += 1
+
+    def catch_up(self):
+        # Apply complete lines appended since the last call; a line still
+        # being written is left for next time
+        if not self.log_path or not os.path.exists(self.log_path):
+            return 0
+        with open(self.log_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        applied = 0
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self.apply(json.loads(line))
+            except (KeyError, TypeError, ValueError) as exc:
+                print(f"Skipping log line {line[:80]!r}: {exc}", file=sys.stderr)
+                continue
+            applied += 1
+        self._offset += end
+        return applied
+
+    def totals(self, project_name):
+        return self.donated.get(project_name, 0), self.targets.get(project_name)
+
+    def changed(self):
+        # (project, donated, target) rows whose gauge would look different
+        # from the last one rendered
+        rows = []
+        for project_name, target_amount in self.targets.items():
+            if not target_amount or target_amount <= 0:
+                continue
+            donated_amount = self.donated.get(project_name, 0)
+            if self._rendered.get(project_name) != visible_state(donated_amount, target_amount):
+                rows.append((project_name, donated_amount, target_amount))
+        return rows
+
+    def mark_rendered(self, rows):
+        for project_name, donated_amount, target_amount in rows:
+            self._rendered[project_name] = visible_state(donated_amount, target_amount)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep donation totals from an event log and render changed gauges.")
+    parser.add_argument("log", help="JSON lines log of donation and target events")
+    parser.add_argument("-o", "--output-dir", default="charts", help="Directory for the PNG files")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes for the initial render")
+    parser.add_argument("--donate", nargs=2, metavar=("PROJECT", "AMOUNT"), action="append", default=[],
+                        help="Append a donation event before rendering (repeatable)")
+    parser.add_argument("--target", nargs=2, metavar=("PROJECT", "AMOUNT"), action="append", default=[],
+                        help="Append a target event before rendering (repeatable)")
+    parser.add_argument("-f", "--follow", action="store_true",
+                        help="Keep reading the log and re-render gauges whose labels change")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between log polls with --follow")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    ledger = DonationLedger.replay(args.log)
+    for project_name, amount in args.target:
+        ledger.record(project_name, target=amount)
+    for project_name, amount in args.donate:
+        ledger.record(project_name, amount)
+    print(f"Replayed {ledger.events} events for {len(ledger.donated)} projects "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    rows = ledger.changed()
+    if rows:
+        # Only charts that were written count as rendered; failed ones stay
+        # in changed() and are tried again
+        render_batch(rows, args.output_dir, args.workers,
+                     on_rendered=lambda row, path: ledger.mark_rendered([row]))
+
+    try:
+        while args.follow:
+            time.sleep(args.interval)
+            if not ledger.catch_up():
+                continue
+            # Small change sets render in-process; no pool start-up per poll
+            for row in ledger.changed():
+                try:
+                    print(render_to_file(GaugeSpec(*row), args.output_dir))
+                except Exception as exc:
+                    print(f"Failed {row[0]!r}: {exc}", file=sys.stderr)
+                    continue
+                ledger.mark_rendered([row])
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+from GaugeGeometry import gauge_geometry, gauge_at
+from GaugeRenderer import GaugeRenderer
+from GaugeSpec import DEFAULT_STYLE, STYLES, GaugeSpec
+
+DEFAULT_FRAMES = 60
+DEFAULT_FPS = 30
+DEFAULT_DPI = 100
+
+def ease_out(steps):
+    # Fast start, gentle stop on the final reading
+    return 1 - (1 - steps) ** 3
+
+def sweep_amounts(donated_amount, frames):
+    return donated_amount * ease_out(np.linspace(0, 1, frames))
+
+def animation_frames(spec, frames=DEFAULT_FRAMES, dpi=DEFAULT_DPI):
+    # Yields RGBA frames of the needle sweeping from 0 to donated_amount.
+    # Title, target label, background arc and pivot are drawn once and
+    # cached as a pixel buffer; each frame restores that buffer and redraws
+    # only the progress arc, needle, needle base and progress label.
+    renderer = GaugeRenderer(dpi, spec.style)
+    renderer.update(spec)
+    moving = renderer.moving
+    for artist in moving:
+        artist.set_animated(True)
+
+    canvas = renderer.canvas
+    canvas.draw()
+    background = canvas.copy_from_bbox(renderer.figure.bbox)
+
+    amounts = sweep_amounts(spec.donated_amount, frames)
+    geometry = gauge_geometry(amounts, np.full(frames, spec.target_amount, dtype=float))
+    for index in range(frames):
+        renderer.set_geometry(gauge_at(geometry, index))
+
+        canvas.restore_region(background)
+        for artist in moving:
+            renderer.ax.draw_artist(artist)
+        yield np.array(canvas.buffer_rgba())
+
+def _images(frames, background=None):
+    for rgba in frames:
+        image = Image.fromarray(rgba, 'RGBA')
+        if background is not None:
+            image = Image.alpha_composite(Image.new('RGBA', image.size, background), image)
+        yield image
+
+def save_animation(frames, path, fps=DEFAULT_FPS, hold=1.0):
+    # .gif (flattened on white, GIF has no partial transparency), .png or
+    # .apng (animated PNG with alpha), anything else is a directory of
+    # numbered PNG frames. The last frame is held for `hold` seconds.
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('.gif', '.png', '.apng'):
+        os.makedirs(path, exist_ok=True)
+        count = 0
+        for count, image in enumerate(_images(frames), 1):
+            image.save(os.path.join(path, f'frame_{count:04d}.png'), compress_level=1)
+        return count
+
+    if extension == '.gif':
+        images = list(_images(frames, background=(255, 255, 255, 255)))
+        # One shared palette from the final frame keeps colours stable
+        palette = images[-1].convert('RGB').quantize(colors=64)
+        images = [image.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+                  for image in images]
+    else:
+        images = list(_images(frames))
+
+    frame_ms = round(1000 / fps)
+    durations = [frame_ms] * (len(images) - 1) + [frame_ms + round(hold * 1000)]
+    # PIL's GIF palette optimisation rescans every frame and costs seconds;
+    # the shared palette above already keeps it small
+    images[0].save(path, format='GIF' if extension == '.gif' else 'PNG', save_all=True,
+                   append_images=images[1:], duration=durations, loop=0, optimize=False)
+    return len(images)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export an animated donation gauge.")
+    parser.add_argument("project_name")
+    parser.add_argument("donated_amount", type=float)
+    parser.add_argument("target_amount", type=float)
+    parser.add_argument("-o", "--output", default="gauge.gif",
+                        help="Output .gif, .png/.apng, or a directory for raw PNG frames")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--style", choices=STYLES, default=DEFAULT_STYLE, help="Gauge style from GaugeSpec")
+    args = parser.parse_args(argv)
+
+    if args.target_amount <= 0 or args.donated_amount < 0 or args.frames < 1:
+        parser.error("amounts must be non-negative, target and frames positive")
+
+    # Whole amounts keep the labels free of ".0"
+    donated = int(args.donated_amount) if args.donated_amount.is_integer() else args.donated_amount
+    target = int(args.target_amount) if args.target_amount.is_integer() else args.target_amount
+    frames = animation_frames(GaugeSpec(args.project_name, donated, target, args.style), args.frames, args.dpi)
+    count = save_animation(frames, args.output, args.fps)
+    print(f"Wrote {count} frames to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
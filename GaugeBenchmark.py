@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from ChartCache import shared_raster_cache
+from ChartProfiles import encode_image, get_profile, profile_dpi
+from DonationChart import (DOWNLOAD_PROFILE, create_gauge_chart, encode_png, gauge_chart, get_chart_image,
+                           render_chart_rgba, render_download)
+from GaugeSpec import GaugeSpec
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "benchmark_baseline.json")
+
+CASES = {
+    "zero": ("Zero Progress", 0, 1000),
+    "half": ("Exactly Half", 500, 1000),
+    "over": ("Over Target", 2500, 1000),
+    "huge": ("Huge Amounts", 987_654_321_012_345, 1_000_000_000_000_000),
+    "long_name": ("A Very Long Project Name " * 12, 1234, 5000),
+}
+
+# Rasters prepared per case so the encode benchmark times encoding only
+_RASTERS = {}
+
+def _figure(case):
+    fig = create_gauge_chart(*case)
+    fig.clear()
+
+def _rasterize(dpi):
+    def run(case):
+        with gauge_chart(*case) as fig:
+            return render_chart_rgba(fig, dpi=dpi).nbytes
+    return run
+
+def _prepare_encode(case):
+    with gauge_chart(*case) as fig:
+        _RASTERS[case] = render_chart_rgba(fig)
+
+def _encode(case):
+    return len(encode_png(_RASTERS[case]).getvalue())
+
+def _end_to_end_png(case):
+    with gauge_chart(*case) as fig:
+        return len(get_chart_image(fig).getvalue())
+
+# The app's download path: ChartProfiles.encode_image with the configured
+# CHART_PROFILE, alone and behind a full render_download
+def _prepare_profile_encode(case):
+    with gauge_chart(*case) as fig:
+        _RASTERS[case] = render_chart_rgba(fig, dpi=profile_dpi(get_profile(DOWNLOAD_PROFILE)))
+
+def _profile_encode(case):
+    profile = get_profile(DOWNLOAD_PROFILE)
+    return len(encode_image(_RASTERS[case], profile, profile_dpi(profile)))
+
+def _download(case):
+    # Without the preview's raster, so every run renders as well
+    shared_raster_cache().clear()
+    return len(render_download(GaugeSpec(*case)))
+
+BENCHMARKS = {
+    "figure_construction": (_figure, None),
+    "rasterize_72dpi": (_rasterize(72), None),
+    "rasterize_150dpi": (_rasterize(150), None),
+    "rasterize_300dpi": (_rasterize(300), None),
+    "png_encode_300dpi": (_encode, _prepare_encode),
+    "get_chart_image": (_end_to_end_png, None),
+    f"encode_{DOWNLOAD_PROFILE}": (_profile_encode, _prepare_profile_encode),
+    f"render_download_{DOWNLOAD_PROFILE}": (_download, None),
+}
+
+def _percentiles(samples):
+    if len(samples) == 1:
+        return {"p50": samples[0], "p90": samples[0], "p99": samples[0]}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p90": cuts[89], "p99": cuts[98]}
+
+def _measure(run, case, repeat):
+    run(case)  # warm-up: imports, font resolution, geometry caches
+    samples = []
+    output_size = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output_size = run(case)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # Peak memory from a separate run, tracemalloc distorts timings
+    tracemalloc.start()
+    run(case)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {key: round(value, 3) for key, value in _percentiles(samples).items()}
+    result["mean"] = round(statistics.fmean(samples), 3)
+    result["peak_kib"] = round(peak / 1024, 1)
+    if output_size is not None:
+        result["output_bytes"] = output_size
+    return result
+
+def _measure_main(case, repeat):
+    # Full script run for one "Generate Chart" click, through Streamlit's
+    # headless test harness: from the click until the chart image is on the
+    # page. The render is asynchronous, so the page is polled like the
+    # browser would; the chart cache is emptied first so every run renders
+    # (set no GAUGE_CACHE_DIR, the disk tier is not cleared).
+    from streamlit.testing.v1 import AppTest
+    from ChartCache import shared_cache
+
+    def run(case):
+        app = AppTest.from_file(os.path.join(HERE, "DonationChart.py"), default_timeout=60).run()
+        app.text_input[0].input(case[0])
+        app.number_input[0].set_value(case[1])
+        app.number_input[1].set_value(case[2])
+        shared_cache().clear()
+        start = time.perf_counter()
+        app.button[0].click().run()
+        while not app.get("image"):
+            if app.exception or app.error:
+                raise RuntimeError((app.exception or app.error)[0].value)
+            if time.perf_counter() - start > 60:
+                raise RuntimeError("chart did not appear within 60s")
+            time.sleep(0.01)
+            app.run()
+        return time.perf_counter() - start
+
+    run(case)
+    samples = [run(case) * 1000 for _ in range(repeat)]
+    result = {key: round(value, 3) for key, value in _percentiles(samples).items()}
+    result["mean"] = round(statistics.fmean(samples), 3)
+    return result
+
+def run_benchmarks(repeat=10, only=None, include_main=True):
+    results = {}
+    for name, (run, prepare) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for case_name, case in CASES.items():
+            if prepare:
+                prepare(case)
+            results[f"{name}[{case_name}]"] = _measure(run, case, repeat)
+            print(f"{name}[{case_name}]: p50 {results[f'{name}[{case_name}]']['p50']:.1f} ms",
+                  file=sys.stderr)
+        _RASTERS.clear()
+
+    if include_main and (not only or "main" in only):
+        for case_name, case in CASES.items():
+            results[f"main[{case_name}]"] = _measure_main(case, max(1, repeat // 5))
+            print(f"main[{case_name}]: p50 {results[f'main[{case_name}]']['p50']:.1f} ms",
+                  file=sys.stderr)
+    return results
+
+def compare(results, baseline, max_regression):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["p50"]
+        ratio = result["p50"] / before if before else float("inf")
+        result["baseline_p50"] = before
+        result["ratio"] = round(ratio, 3)
+        if ratio > max_regression:
+            regressions.append((name, before, result["p50"], ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the gauge rendering hot path.")
+    parser.add_argument("-n", "--repeat", type=int, default=10, help="Timed runs per benchmark and case")
+    parser.add_argument("-k", "--only", action="append",
+                        help="Run only this benchmark (repeatable); 'main' selects the end-to-end run")
+    parser.add_argument("--no-main", action="store_true", help="Skip the end-to-end main() benchmark")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="Fail when a p50 exceeds baseline by this factor")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeat, args.only, not args.no_main)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: p50 {before:.1f} -> {after:.1f} ms ({ratio:.2f}x)", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import argparse
+import math
+import os
+import sys
+import textwrap
+import time
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+from matplotlib.figure import Figure
+
+from BatchChart import load_rows
+from GaugeFonts import text_style
+from GaugeGeometry import INNER_RADIUS, PIVOT_RADIUS, SCALE, background_arc, gauge_geometry
+
+# One gauge tile in data units: the gauge spans x in (-1, 1) and y in
+# (0, 1) around its pivot, with room for labels below and a two-line
+# title above
+TILE_WIDTH = 2.8
+TILE_HEIGHT = 2.2
+TILE_PIVOT_Y = 0.65
+TITLE_LINES = 2
+
+
+class GaugeDashboard:
+    # Many gauges on one figure: every tile's arcs, needles and pivots are
+    # drawn by a handful of shared collections, and the figure is rendered
+    # and encoded once per page. Like GaugeRenderer, the figure and its
+    # text artists are built once and only updated between pages, so use
+    # one instance per thread.
+
+    def __init__(self, columns=10, rows=5, tile_inches=3.0, dpi=150):
+        self.columns = columns
+        self.rows = rows
+        self.capacity = columns * rows
+        self.dpi = dpi
+        self.figure = Figure(figsize=(columns * tile_inches, rows * tile_inches * TILE_HEIGHT / TILE_WIDTH),
+                             dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_axes([0, 0, 1, 1])
+        self.figure.patch.set_facecolor('none')
+        ax.patch.set_facecolor('none')
+        ax.set_xlim(0, columns * TILE_WIDTH)
+        ax.set_ylim(-rows * TILE_HEIGHT, 0)
+        ax.axis('off')
+
+        # Line widths and font sizes shrink with the tile, relative to the
+        # single 12x8 inch chart
+        scale = tile_inches * 72 / TILE_WIDTH / SCALE
+        self.background = LineCollection([], colors='red', linewidths=30 * scale, capstyle='projecting')
+        self.progress = LineCollection([], colors='green', linewidths=30 * scale, capstyle='projecting')
+        self.needles = PolyCollection([], facecolors='black', edgecolors='black', zorder=3)
+        self.bases = LineCollection([], colors='black', linewidths=2 * scale, zorder=4)
+        for collection in (self.background, self.progress, self.needles, self.bases):
+            ax.add_collection(collection)
+        self.pivots = [
+            EllipseCollection(2 * radius, 2 * radius, 0, units='xy', facecolors=color,
+                              offsets=np.empty((0, 2)), offset_transform=ax.transData, zorder=zorder)
+            for radius, color, zorder in ((PIVOT_RADIUS, 'black', 5), (INNER_RADIUS, 'white', 6))
+        ]
+        for collection in self.pivots:
+            ax.add_collection(collection)
+
+        # Text artists for every tile, positioned once
+        label_style = text_style(15 * scale)
+        progress_style = text_style(26 * scale)
+        title_style = text_style(30 * scale)
+        self.labels = []
+        for x, y in self._pivots(self.capacity):
+            self.labels.append((
+                ax.text(x - 1, y - 0.19, '', ha='center', color='black', **label_style),
+                ax.text(x + 1, y - 0.19, '', ha='center', color='black', **label_style),
+                ax.text(x, y - 0.4, '', ha='center', color='black', **progress_style),
+                ax.text(x, y + 1.15, '', ha='center', va='bottom', multialignment='center',
+                        color='black', **title_style),
+            ))
+
+    def _pivots(self, count):
+        index = np.arange(count)
+        x = (index % self.columns + 0.5) * TILE_WIDTH
+        y = -(index // self.columns) * TILE_HEIGHT - TILE_HEIGHT + TILE_PIVOT_Y
+        return np.column_stack([x, y])
+
+    def update(self, rows):
+        # rows: up to `capacity` (project, donated, target) tuples; unused
+        # tiles are left empty
+        rows = list(rows)
+        if len(rows) > self.capacity:
+            raise ValueError(f"{len(rows)} gauges do not fit a {self.columns}x{self.rows} page")
+
+        pivots = self._pivots(len(rows))
+        if rows:
+            geometry = gauge_geometry([row[1] for row in rows], [row[2] for row in rows])
+            offsets = pivots[:, None, :]
+            self.background.set_segments(background_arc()[None] + offsets)
+            self.progress.set_segments(geometry.progress + offsets)
+            self.needles.set_verts(geometry.needle + offsets)
+            self.bases.set_segments(geometry.base + offsets)
+            progress_labels = geometry.progress_label
+        else:
+            for collection in (self.background, self.progress, self.bases):
+                collection.set_segments([])
+            self.needles.set_verts([])
+            progress_labels = []
+        for collection in self.pivots:
+            collection.set_offsets(pivots)
+
+        for index, (donated_text, target_text, progress_text, title) in enumerate(self.labels):
+            if index < len(rows):
+                project_name, donated_amount, target_amount = rows[index]
+                donated_text.set_text(f'Donated: ${donated_amount:,}')
+                target_text.set_text(f'Target: ${target_amount:,}')
+                progress_text.set_text(f'Progress: {progress_labels[index]}%')
+                title.set_text(textwrap.fill(project_name, width=20, max_lines=TITLE_LINES, placeholder='...'))
+            else:
+                for text in (donated_text, target_text, progress_text, title):
+                    text.set_text('')
+        return self.figure
+
+    def render_png(self, rows):
+        self.update(rows)
+        img_buffer = BytesIO()
+        self.canvas.print_png(img_buffer)
+        img_buffer.seek(0)
+        return img_buffer
+
+def dashboard_pages(rows, columns=10, page_rows=5, tile_inches=3.0, dpi=150):
+    # One PNG per page of columns x page_rows gauges; the figure, fonts and
+    # text artists are built once and reused for every page
+    rows = list(rows)
+    if len(rows) <= columns:
+        columns, page_rows = max(len(rows), 1), 1
+    else:
+        page_rows = min(page_rows, math.ceil(len(rows) / columns))
+    dashboard = GaugeDashboard(columns, page_rows, tile_inches, dpi)
+    for start in range(0, len(rows), dashboard.capacity):
+        yield dashboard.render_png(rows[start:start + dashboard.capacity])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render many donation gauges as dashboard pages.")
+    parser.add_argument("input", help="CSV or JSON file with project_name, donated_amount, target_amount")
+    parser.add_argument("-o", "--output", default="dashboard.png",
+                        help="Output file; pages after the first get _2, _3, ... suffixes")
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--per-page", type=int, default=50, help="Gauges per page, rounded up to whole rows")
+    parser.add_argument("--tile-inches", type=float, default=3.0, help="Width of one gauge tile")
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args(argv)
+
+    rows = load_rows(args.input)
+    if not rows:
+        print("No valid rows to render.", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    base, extension = os.path.splitext(args.output)
+    page_rows = max(1, math.ceil(args.per_page / args.columns))
+    pages = dashboard_pages(rows, args.columns, page_rows, args.tile_inches, args.dpi)
+    for number, page in enumerate(pages, 1):
+        path = args.output if number == 1 else f"{base}_{number}{extension or '.png'}"
+        with open(path, "wb") as f:
+            f.write(page.getbuffer())
+        print(path)
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {len(rows)} gauges in {number} page(s) in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
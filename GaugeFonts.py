@@ -0,0 +1,69 @@
+import glob
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+# Family the charts are styled with, and where to look for a bundled copy
+# of it. GAUGE_FONT_FILE points at a specific .ttf/.otf and wins over both.
+# Without Garamond, matplotlib has always fallen back to its default
+# sans-serif face (DejaVu Sans), and charts keep looking the same.
+FONT_FAMILY = 'Garamond'
+FALLBACK_FAMILY = 'sans-serif'
+FONT_WEIGHT = 'bold'
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts')
+
+ResolvedFont = namedtuple('ResolvedFont', [
+    'requested',    # family asked for
+    'name',         # family actually used
+    'path',         # font file every render loads directly
+    'source',       # 'env', 'bundled', 'system' or 'fallback'
+    'metrics',      # units_per_EM, ascender, descender of the face
+])
+
+
+def _bundled_font_file():
+    path = os.environ.get('GAUGE_FONT_FILE')
+    if path:
+        return path, 'env'
+    candidates = sorted(glob.glob(os.path.join(FONT_DIR, '*.[ot]tf')))
+    # Prefer a bold face of the configured family when several are bundled
+    for candidate in candidates:
+        name = os.path.basename(candidate).lower()
+        if FONT_FAMILY.lower() in name and 'bold' in name:
+            return candidate, 'bundled'
+    if candidates:
+        return candidates[0], 'bundled'
+    return None, None
+
+@lru_cache(maxsize=None)
+def resolved_font():
+    # Resolved once per process; text artists then get the file path, so
+    # matplotlib never has to run findfont (or warn about Garamond) again
+    from matplotlib import font_manager
+
+    path, source = _bundled_font_file()
+    if path is None:
+        properties = font_manager.FontProperties(
+            family=[FONT_FAMILY, FALLBACK_FAMILY], weight=FONT_WEIGHT)
+        path = font_manager.findfont(properties)
+        source = 'system'
+
+    font = font_manager.get_font(path)
+    if source == 'system' and font.family_name.lower() != FONT_FAMILY.lower():
+        source = 'fallback'
+    metrics = {
+        'units_per_EM': font.units_per_EM,
+        'ascender': font.ascender,
+        'descender': font.descender,
+    }
+    return ResolvedFont(FONT_FAMILY, font.family_name, path, source, metrics)
+
+@lru_cache(maxsize=None)
+def font_properties(size=None):
+    from matplotlib.font_manager import FontProperties
+    return FontProperties(fname=resolved_font().path, weight=FONT_WEIGHT, size=size)
+
+def text_style(size=None):
+    # Keyword arguments for ax.text / set_title. The size has to live in
+    # the FontProperties: set_title applies fontproperties after fontsize
+    return {'fontproperties': font_properties(size)}
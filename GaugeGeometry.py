@@ -0,0 +1,127 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+START_ANGLE = 180
+ARC_POINTS = 100
+NEEDLE_LENGTH = 0.92
+NEEDLE_WIDTH = 0.06
+BASE_RADIUS = 0.02
+PIVOT_RADIUS = 0.06
+INNER_RADIUS = 0.03
+# progress_label is an int64; percentages from here on would overflow it
+MAX_PERCENTAGE = 2.0 ** 63
+
+# Layout of the 12x8 inch matplotlib figure, in points. The axes use the
+# default subplot box and aspect='equal' over (-1.2, 1.2), so the square
+# plot area is centred in that box.
+WIDTH = 864
+HEIGHT = 576
+SCALE = 0.77 * HEIGHT / 2.4
+CENTER_X = (0.125 + 0.775 / 2) * WIDTH
+CENTER_Y = HEIGHT - (0.11 + 0.77 / 2) * HEIGHT
+AXES_TOP = HEIGHT - 0.88 * HEIGHT
+TITLE_Y = AXES_TOP - 20
+TITLE_SIZE = 30
+TITLE_LINE_HEIGHT = TITLE_SIZE * 1.2
+
+GaugeGeometry = namedtuple('GaugeGeometry', [
+    'actual_percentage',   # (N,) donated / target
+    'visual_percentage',   # (N,) clamped to 1.0
+    'progress_end_angle',  # (N,) degrees
+    'needle_angle',        # (N,) degrees
+    'progress_label',      # (N,) rounded percentage shown in the label
+    'background',          # (ARC_POINTS, 2), shared by every gauge
+    'progress',            # (N, ARC_POINTS, 2)
+    'needle',              # (N, 3, 2) tip, base left, base right
+    'base',                # (N, ARC_POINTS, 2)
+])
+
+
+@lru_cache(maxsize=None)
+def unit_steps(points=ARC_POINTS):
+    steps = np.linspace(0, 1, points)
+    steps.flags.writeable = False
+    return steps
+
+@lru_cache(maxsize=None)
+def background_arc(points=ARC_POINTS):
+    theta = np.radians(np.linspace(START_ANGLE, START_ANGLE - 180, points))
+    arc = np.column_stack([np.cos(theta), np.sin(theta)])
+    arc.flags.writeable = False
+    return arc
+
+@lru_cache(maxsize=None)
+def base_half_circle(points=ARC_POINTS):
+    # Needle base for a needle pointing along +x; rotated per gauge
+    theta = np.radians(np.linspace(-90, 90, points))
+    arc = BASE_RADIUS * np.column_stack([np.cos(theta), np.sin(theta)])
+    arc.flags.writeable = False
+    return arc
+
+def needle_angles(donated_amounts, actual_percentage, progress_end_angle):
+    return np.where(
+        donated_amounts == 0,
+        START_ANGLE + (0.03 * 180),
+        np.where(actual_percentage == 0.5, START_ANGLE - 90, progress_end_angle - 4.7),
+    )
+
+def gauge_geometry(donated_amounts, target_amounts):
+    donated_amounts = np.atleast_1d(np.asarray(donated_amounts, dtype=float))
+    target_amounts = np.atleast_1d(np.asarray(target_amounts, dtype=float))
+
+    actual_percentage = donated_amounts / target_amounts
+    visual_percentage = np.minimum(actual_percentage, 1.0)
+    progress_end_angle = START_ANGLE - (visual_percentage * 180)
+    needle_angle = needle_angles(donated_amounts, actual_percentage, progress_end_angle)
+
+    # Progress arcs: N x ARC_POINTS angles in one go
+    theta = np.radians(START_ANGLE + unit_steps() * (progress_end_angle[:, None] - START_ANGLE))
+    progress = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+
+    # Needle triangles from the needle direction and its normal
+    radians = np.radians(needle_angle)
+    direction = np.stack([np.cos(radians), np.sin(radians)], axis=-1)
+    normal = np.stack([-direction[:, 1], direction[:, 0]], axis=-1)
+    needle = np.stack([
+        NEEDLE_LENGTH * direction,
+        NEEDLE_WIDTH * normal,
+        -NEEDLE_WIDTH * normal,
+    ], axis=1)
+
+    # Needle bases: the cached half circle rotated onto each needle
+    half_circle = base_half_circle()
+    base = (half_circle[None, :, 0, None] * direction[:, None, :]
+            + half_circle[None, :, 1, None] * normal[:, None, :])
+
+    return GaugeGeometry(
+        actual_percentage=actual_percentage,
+        visual_percentage=visual_percentage,
+        progress_end_angle=progress_end_angle,
+        needle_angle=needle_angle,
+        progress_label=np.round(actual_percentage * 100).astype(int),
+        background=background_arc(),
+        progress=progress,
+        needle=needle,
+        base=base,
+    )
+
+def gauge_at(geometry, index):
+    # Geometry of one gauge out of a batch, with the per-gauge fields unwrapped
+    return geometry._replace(**{
+        field: getattr(geometry, field)[index]
+        for field in geometry._fields if field != 'background'
+    })
+
+def single_geometry(donated_amount, target_amount):
+    return gauge_at(gauge_geometry(donated_amount, target_amount), 0)
+
+def title_layout(lines):
+    # Vertical position (in points from the top) of each title line's
+    # centre. matplotlib pushes a wrapped title up so it never overlaps
+    # the axes.
+    block_height = TITLE_LINE_HEIGHT * len(lines) if len(lines) > 1 else TITLE_SIZE
+    center_y = min(TITLE_Y, AXES_TOP - block_height / 2)
+    first_y = center_y - (len(lines) - 1) * TITLE_LINE_HEIGHT / 2
+    return [first_y + i * TITLE_LINE_HEIGHT for i in range(len(lines))]
@@ -0,0 +1,61 @@
+import argparse
+import http.client
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+def _worker(url, dpi, requests, unique, offset, latencies, statuses, lock):
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    for i in range(requests):
+        donated = offset + i if unique else 500
+        query = urlencode({"project": "Load Test", "donated": donated, "target": 1000, "dpi": dpi})
+        start = time.perf_counter()
+        try:
+            connection.request("GET", f"{url.path}?{query}")
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+            status = "error"
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+    connection.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a running GaugeServer.")
+    parser.add_argument("url", nargs="?", default="http://127.0.0.1:8000/gauge.png")
+    parser.add_argument("--dpi", type=int, default=72)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-n", "--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--unique", action="store_true",
+                        help="Vary the donated amount on every request so nothing is cacheable")
+    args = parser.parse_args(argv)
+
+    url = urlparse(args.url)
+    latencies, statuses, lock = [], {}, threading.Lock()
+    threads = [
+        threading.Thread(target=_worker, args=(url, args.dpi, args.requests, args.unique,
+                                               i * args.requests, latencies, statuses, lock))
+        for i in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"{len(latencies)} requests in {elapsed:.2f}s: {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50 {cuts[49]:.1f} ms, p90 {cuts[89]:.1f} ms, p99 {cuts[98]:.1f} ms")
+    print("status codes: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items(), key=str)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
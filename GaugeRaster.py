@@ -0,0 +1,207 @@
+import struct
+import textwrap
+import zlib
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+
+from GaugeFonts import resolved_font
+from GaugeGeometry import (BASE_RADIUS, CENTER_X, CENTER_Y, HEIGHT, INNER_RADIUS, PIVOT_RADIUS,
+                           SCALE, START_ANGLE, TITLE_SIZE, WIDTH, single_geometry, title_layout)
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+GREEN = (0, 128, 0)
+
+
+@lru_cache(maxsize=None)
+def _font():
+    # matplotlib is only used to rasterize glyphs into the atlas; charts
+    # themselves never go through a Figure
+    from matplotlib.ft2font import FT2Font
+    return FT2Font(resolved_font().path)
+
+@lru_cache(maxsize=4096)
+def _glyph(char, size, dpi):
+    # Returns (alpha bitmap, x offset, descent, advance) in pixels
+    font = _font()
+    font.set_size(size, dpi)
+    font.set_text(char, 0)
+    font.draw_glyphs_to_bitmap(antialiased=True)
+    bitmap = np.asarray(font.get_image()).astype(np.float32) / 255
+    x_offset = font.get_bitmap_offset()[0] / 64
+    descent = font.get_descent() / 64
+    advance = font.load_char(ord(char)).horiAdvance / 64
+    return bitmap, x_offset, descent, advance
+
+
+class GaugeCanvas:
+
+    def __init__(self, dpi=300):
+        self.dpi = dpi
+        self.px_per_pt = dpi / 72
+        self.width = round(WIDTH * self.px_per_pt)
+        self.height = round(HEIGHT * self.px_per_pt)
+        self.scale = SCALE * self.px_per_pt
+        self.center_x = CENTER_X * self.px_per_pt
+        self.center_y = CENTER_Y * self.px_per_pt
+        self.pixels = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+
+    def _window(self, x0, y0, x1, y1):
+        # Pixel window covering a data-space box, plus data coordinates of
+        # the pixel centres inside it
+        left = max(int(self.center_x + x0 * self.scale) - 2, 0)
+        right = min(int(self.center_x + x1 * self.scale) + 3, self.width)
+        top = max(int(self.center_y - y1 * self.scale) - 2, 0)
+        bottom = min(int(self.center_y - y0 * self.scale) + 3, self.height)
+        xs = (np.arange(left, right, dtype=np.float32) + 0.5 - self.center_x) / self.scale
+        ys = (self.center_y - np.arange(top, bottom, dtype=np.float32) - 0.5) / self.scale
+        return (top, left), xs[None, :], ys[:, None]
+
+    def _coverage(self, distance):
+        # Signed distance in data units to antialiased pixel coverage
+        return np.clip(0.5 - distance * self.scale, 0, 1)
+
+    def composite(self, origin, coverage, color):
+        rows, cols = np.nonzero(coverage)
+        self.composite_sparse(rows + origin[0], cols + origin[1], coverage[rows, cols], color)
+
+    def composite_sparse(self, rows, cols, alpha, color):
+        # Fully covered pixels are simply overwritten, only the antialiased
+        # edge pixels are blended
+        solid = alpha >= 1
+        self.pixels[rows[solid], cols[solid]] = (*color, 255)
+
+        edge = ~solid
+        index = (rows[edge], cols[edge])
+        alpha = alpha[edge][:, None]
+        dst = self.pixels[index].astype(np.float32)
+        dst_alpha = dst[:, 3:] / 255
+        out_alpha = alpha + dst_alpha * (1 - alpha)
+        rgb = np.asarray(color, dtype=np.float32) * alpha + dst[:, :3] * dst_alpha * (1 - alpha)
+        dst[:, :3] = rgb / out_alpha
+        dst[:, 3:] = out_alpha * 255
+        self.pixels[index] = np.rint(dst).astype(np.uint8)
+
+    def arc(self, radius, start_angle, end_angle, line_width, color):
+        # Ring mask limited by angle, with projecting caps like matplotlib lines
+        half_width = line_width / 2 / SCALE
+        low, high = sorted((start_angle, end_angle))
+        angles = [low, high] + [a for a in range(-360, 361, 90) if low < a < high]
+        xs = radius * np.cos(np.radians(angles))
+        ys = radius * np.sin(np.radians(angles))
+        pad = half_width * 1.5
+        origin, xs, ys = self._window(xs.min() - pad, ys.min() - pad, xs.max() + pad, ys.max() + pad)
+
+        r = np.hypot(xs, ys)
+        ring = np.abs(r - radius) - half_width
+        rows, cols = np.nonzero(ring < 1 / self.scale)
+        r = r[rows, cols]
+        theta = np.degrees(np.arctan2(ys[rows, 0], xs[0, cols]))
+        middle = (start_angle + end_angle) / 2
+        half_span = abs(start_angle - end_angle) / 2
+        delta = np.abs((theta - middle + 180) % 360 - 180)
+        beyond_end = np.radians(delta - half_span) * r
+        distance = np.maximum(ring[rows, cols], beyond_end - half_width)
+
+        coverage = self._coverage(distance)
+        drawn = coverage > 0
+        self.composite_sparse(rows[drawn] + origin[0], cols[drawn] + origin[1], coverage[drawn], color)
+
+    def circle(self, radius, color):
+        origin, xs, ys = self._window(-radius, -radius, radius, radius)
+        self.composite(origin, self._coverage(np.hypot(xs, ys) - radius), color)
+
+    def triangle(self, points, color):
+        points = np.asarray(points, dtype=np.float32)
+        origin, xs, ys = self._window(*points.min(axis=0), *points.max(axis=0))
+        # Orientation so edge normals point outwards
+        (ax, ay), (bx, by), (cx, cy) = points
+        sign = 1 if (bx - ax) * (cy - ay) - (by - ay) * (cx - ax) > 0 else -1
+        distance = None
+        for (x0, y0), (x1, y1) in zip(points, np.roll(points, -1, axis=0)):
+            length = np.hypot(x1 - x0, y1 - y0)
+            edge = sign * ((xs - x0) * (y1 - y0) - (ys - y0) * (x1 - x0)) / length
+            distance = edge if distance is None else np.maximum(distance, edge)
+        self.composite(origin, self._coverage(distance), color)
+
+    def text(self, x, y, text, size, color=BLACK):
+        # Horizontally centred on (x, y), with y the baseline in pixels
+        glyphs = [_glyph(char, size, self.dpi) for char in text]
+        pen = x - sum(glyph[3] for glyph in glyphs) / 2
+        for bitmap, x_offset, descent, advance in glyphs:
+            left = round(pen + x_offset)
+            bottom = round(y + descent) + 1
+            top = bottom - bitmap.shape[0]
+            pen += advance
+            if bitmap.size == 0:
+                continue
+            # Clip to the canvas, titles can run off the top edge
+            clip_top = max(-top, 0)
+            clip_left = max(-left, 0)
+            coverage = bitmap[clip_top:self.height - top, clip_left:self.width - left]
+            if coverage.size:
+                self.composite((top + clip_top, left + clip_left), coverage, color)
+
+    def data_text(self, x, y, text, size):
+        self.text(self.center_x + x * self.scale, self.center_y - y * self.scale, text, size)
+
+    def png(self, compress_level=1):
+        # Filter type 0 (None) on every scanline
+        raw = np.empty((self.height, self.width * 4 + 1), dtype=np.uint8)
+        raw[:, 0] = 0
+        raw[:, 1:] = self.pixels.reshape(self.height, -1)
+
+        def chunk(kind, data):
+            return (struct.pack(">I", len(data)) + kind + data
+                    + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 6, 0, 0, 0)
+        pixels_per_metre = round(self.dpi / 0.0254)
+        physical = struct.pack(">IIB", pixels_per_metre, pixels_per_metre, 1)
+        return b"".join([
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"pHYs", physical),
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level)),
+            chunk(b"IEND", b""),
+        ])
+
+
+def draw_gauge(project_name, donated_amount, target_amount, dpi=300, geometry=None):
+    if geometry is None:
+        geometry = single_geometry(donated_amount, target_amount)
+
+    canvas = GaugeCanvas(dpi)
+    draw_shapes(canvas, geometry)
+    draw_labels(canvas, project_name, donated_amount, target_amount, geometry)
+    return canvas
+
+def draw_shapes(canvas, geometry):
+    # Arcs, needle and pivot: everything except the text
+    needle_angle = float(geometry.needle_angle)
+    canvas.arc(1, START_ANGLE, START_ANGLE - 180, 30, RED)
+    if geometry.visual_percentage > 0:
+        canvas.arc(1, START_ANGLE, float(geometry.progress_end_angle), 30, GREEN)
+
+    canvas.triangle(geometry.needle, BLACK)
+    canvas.arc(BASE_RADIUS, needle_angle - 90, needle_angle + 90, 2, BLACK)
+    canvas.circle(PIVOT_RADIUS, BLACK)
+    canvas.circle(INNER_RADIUS, WHITE)
+
+def draw_labels(canvas, project_name, donated_amount, target_amount, geometry):
+    canvas.data_text(-1, -0.19, f'Donated: ${donated_amount:,}', 15)
+    canvas.data_text(1, -0.19, f'Target: ${target_amount:,}', 15)
+    canvas.data_text(0, -0.4, f'Progress: {geometry.progress_label}%', 26)
+
+    # Project title; the baseline sits ~0.35em below each line's centre
+    lines = textwrap.fill(project_name, width=20).split("\n")
+    for line, center_y in zip(lines, title_layout(lines)):
+        baseline = (center_y + 0.35 * TITLE_SIZE) * canvas.px_per_pt
+        canvas.text(canvas.center_x, baseline, line, TITLE_SIZE)
+
+def gauge_png(project_name, donated_amount, target_amount, dpi=300, compress_level=1, geometry=None):
+    canvas = draw_gauge(project_name, donated_amount, target_amount, dpi, geometry)
+    return BytesIO(canvas.png(compress_level))
@@ -0,0 +1,109 @@
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle, Polygon
+
+from GaugeGeometry import INNER_RADIUS, PIVOT_RADIUS, background_arc, single_geometry
+from GaugeSpec import (DEFAULT_STYLE, LINE_PIVOT_RADIUS, SUMMARY_STEP, SUMMARY_Y, get_style, money_text,
+                       progress_text, style_font, summary_lines, summary_sizes, title_kwargs, title_text)
+
+
+class GaugeRenderer:
+    # Builds the static parts of the gauge once and only updates the
+    # progress arc, needle and labels per chart. Positions, sizes and
+    # formats come from the style's GaugeStyle preset, the same one
+    # spec_figure draws. A renderer owns one figure and one style, so use
+    # one instance per thread and style.
+
+    def __init__(self, dpi=300, style=DEFAULT_STYLE):
+        self.dpi = dpi
+        self.style = style
+        preset = self.preset = get_style(style)
+        self.figure = Figure(figsize=(12, 8), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.ax = self.figure.add_subplot(aspect='equal')
+
+        # Transparent output, same as savefig(transparent=True)
+        self.figure.patch.set_facecolor('none')
+        ax.patch.set_facecolor('none')
+
+        # Static: gauge background (red arc)
+        ax.plot(*background_arc().T, color='red', lw=30)
+
+        # Dynamic: progress arc and needle (with its base for the wedge)
+        self.progress_line, = ax.plot([], [], color='green', lw=30)
+        if preset.needle == 'wedge':
+            self.needle = Polygon(np.zeros((3, 2)), closed=True, color='black', zorder=3)
+            ax.add_patch(self.needle)
+            self.base_line, = ax.plot([], [], color='black', lw=2, zorder=4)
+            # Static: pivot
+            ax.add_artist(Circle((0, 0), PIVOT_RADIUS, color='black', zorder=5))
+            ax.add_artist(Circle((0, 0), INNER_RADIUS, color='white', zorder=6))
+            self.moving = [self.progress_line, self.needle, self.base_line]
+        else:
+            self.needle, = ax.plot([], [], color='black', lw=2)
+            self.base_line = None
+            ax.add_artist(Circle((0, 0), LINE_PIVOT_RADIUS, color='black', zorder=5))
+            self.moving = [self.progress_line, self.needle]
+
+        # Dynamic: labels and title
+        label_style = style_font(preset, preset.label_size)
+        self.donated_text = ax.text(-1, preset.label_y, '', horizontalalignment='center',
+                                    color='black', **label_style)
+        self.target_text = ax.text(1, preset.label_y, '', horizontalalignment='center',
+                                   color='black', **label_style)
+        self.progress_text = ax.text(0, preset.progress_y, '', horizontalalignment='center',
+                                     color='black', **style_font(preset, preset.progress_size))
+        self.moving.append(self.progress_text)
+        self.summary_texts = [
+            ax.text(0, SUMMARY_Y - index * SUMMARY_STEP, '', horizontalalignment='center',
+                    color='black', **style_font(preset, size))
+            for index, size in enumerate(summary_sizes(preset) if preset.summary else ())
+        ]
+        self.title = ax.set_title('', **title_kwargs(preset))
+
+        ax.set_xlim(-1.2, 1.2)
+        ax.set_ylim(-1.2, 1.2)
+        ax.axis('off')
+
+    def set_geometry(self, geometry):
+        # The parts that move with the amounts: arc, needle, progress label
+        self.progress_line.set_data(*geometry.progress.T)
+        if self.base_line is not None:
+            self.needle.set_xy(geometry.needle)
+            self.base_line.set_data(*geometry.base.T)
+        else:
+            # Unit-length line along the (clamped) progress end
+            angle = np.radians(geometry.progress_end_angle)
+            self.needle.set_data([0, np.cos(angle)], [0, np.sin(angle)])
+        self.progress_text.set_text(progress_text(self.preset, geometry))
+
+    def update(self, spec, geometry=None):
+        if spec.style != self.style:
+            raise ValueError(f"renderer draws the {self.style!r} style, not {spec.style!r}")
+        if geometry is None:
+            geometry = single_geometry(spec.donated_amount, spec.target_amount)
+
+        self.set_geometry(geometry)
+        self.donated_text.set_text(f'Donated: {money_text(self.preset, spec.donated_amount)}')
+        self.target_text.set_text(f'Target: {money_text(self.preset, spec.target_amount)}')
+        if self.summary_texts:
+            for text, line in zip(self.summary_texts, summary_lines(spec)):
+                text.set_text(line)
+        self.title.set_text(title_text(self.preset, spec.project_name))
+        return self.figure
+
+    def close(self):
+        # Drop the artists and the cached Agg buffer now rather than when
+        # the cycle collector gets to the figure
+        self.figure.clear()
+        self.canvas = FigureCanvasAgg(self.figure)
+
+    def render_png(self, spec, geometry=None):
+        self.update(spec, geometry)
+        img_buffer = BytesIO()
+        self.canvas.print_png(img_buffer)
+        img_buffer.seek(0)
+        return img_buffer
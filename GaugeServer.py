@@ -0,0 +1,190 @@
+import argparse
+import json
+import math
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from BatchChart import parse_amount
+from ChartCache import DEFAULT_MAX_BYTES, DEFAULT_MAX_DISK_BYTES, ChartCache
+from GaugeGeometry import MAX_PERCENTAGE
+from GaugeSpec import DEFAULT_STYLE, GaugeSpec
+from RenderScheduler import Busy, RenderScheduler
+
+MIN_DPI = 30
+MAX_DPI = 300
+
+# Retained-mode renderers of the most recently used styles and DPIs in
+# each worker process. Each holds a full-size Agg buffer (about 30 MB at
+# 300 dpi), so clients cycling through DPIs only ever keep a few alive.
+MAX_RENDERERS = 3
+_renderers = OrderedDict()
+
+def render_png(spec, dpi):
+    from GaugeRenderer import GaugeRenderer
+
+    renderer = _renderers.get((spec.style, dpi))
+    if renderer is None:
+        renderer = _renderers[spec.style, dpi] = GaugeRenderer(dpi, spec.style)
+        while len(_renderers) > MAX_RENDERERS:
+            _renderers.popitem(last=False)[1].close()
+    else:
+        _renderers.move_to_end((spec.style, dpi))
+    return renderer.render_png(spec).getvalue()
+
+def gauge_etag(key):
+    return '"' + key[:32] + '"'
+
+
+class GaugeRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/healthz":
+            return self._send(200, b"ok\n", "text/plain")
+        if url.path == "/stats":
+            stats = {"cache": self.server.cache.stats(), "scheduler": self.server.scheduler.stats()}
+            body = json.dumps(stats).encode("utf-8")
+            return self._send(200, body, "application/json")
+        if url.path not in ("/gauge.png", "/gauge.svg"):
+            return self._send(404, b"not found\n", "text/plain")
+
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            project_name = params["project"]
+            donated_amount = parse_amount(params["donated"])
+            target_amount = parse_amount(params["target"])
+            dpi = int(params.get("dpi", MAX_DPI))
+            spec = GaugeSpec(project_name, donated_amount, target_amount, params.get("style", DEFAULT_STYLE))
+        except (KeyError, ValueError) as exc:
+            return self._send(400, f"invalid or missing parameter: {exc}\n".encode(), "text/plain")
+        if not (math.isfinite(donated_amount) and math.isfinite(target_amount)):
+            return self._send(400, b"amounts must be finite numbers\n", "text/plain")
+        if donated_amount < 0 or target_amount <= 0 or not MIN_DPI <= dpi <= MAX_DPI:
+            return self._send(400, b"amounts or dpi out of range\n", "text/plain")
+        # Finite amounts can still give a percentage past the int64 progress
+        # label (1 / 1e-300), or overflow to inf; NaN fails the test too
+        if not donated_amount / target_amount * 100 < MAX_PERCENTAGE:
+            return self._send(400, b"donated / target is too large\n", "text/plain")
+
+        kind = url.path.rsplit(".", 1)[1]
+        key = spec.key(kind, dpi)
+        etag = gauge_etag(key)
+        headers = {"ETag": etag, "Cache-Control": self.server.cache_control}
+        if etag in self.headers.get("If-None-Match", ""):
+            return self._send(304, b"", None, headers)
+
+        if kind == "svg":
+            from GaugeSvg import gauge_svg
+            if spec.style != DEFAULT_STYLE:
+                return self._send(400, f"SVG is only drawn in the {DEFAULT_STYLE} style\n".encode(), "text/plain")
+            try:
+                body = gauge_svg(project_name, donated_amount, target_amount).encode("utf-8")
+            except Exception as exc:
+                return self._send_render_error(exc)
+            return self._send(200, body, "image/svg+xml", headers)
+
+        body = self.server.cache.get(key)
+        if body is not None:
+            return self._send(200, body, "image/png", headers)
+
+        # Identical requests share one render; when the queue is full wait
+        # briefly for room, then shed load
+        try:
+            future = self.server.scheduler.submit(key, render_png, spec, dpi, timeout=self.server.queue_timeout)
+        except Busy:
+            return self._send(503, b"busy, retry shortly\n", "text/plain", {"Retry-After": "1"})
+        try:
+            body = future.result(timeout=self.server.render_timeout)
+        except FutureTimeoutError:
+            return self._send(504, b"render timed out\n", "text/plain")
+        except Exception as exc:
+            return self._send_render_error(exc)
+        self.server.cache.put(key, body)
+        return self._send(200, body, "image/png", headers)
+
+    def _send_render_error(self, exc):
+        # matplotlib rejects text it cannot lay out (e.g. a project name
+        # with broken $...$ math) with ValueError: the client's input is at
+        # fault. Anything else is ours.
+        if isinstance(exc, ValueError):
+            return self._send(400, f"cannot render chart: {exc}\n".encode(), "text/plain")
+        self.log_error("render failed: %r", exc)
+        return self._send(500, b"render failed\n", "text/plain")
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class GaugeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, max_pending=None, queue_timeout=2.0,
+                 render_timeout=30.0, max_age=300, verbose=False, cache=None):
+        workers = workers or os.cpu_count() or 1
+        # Renders running or queued in the pool; beyond this requests get 503
+        self.scheduler = RenderScheduler(workers, max_pending, ProcessPoolExecutor(max_workers=workers))
+        self.queue_timeout = queue_timeout
+        self.render_timeout = render_timeout
+        self.cache_control = f"public, max-age={max_age}"
+        self.verbose = verbose
+        self.cache = cache or ChartCache()
+        # Last: when binding fails, TCPServer.__init__ calls server_close,
+        # which needs the scheduler
+        super().__init__(address, GaugeRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.scheduler.shutdown(wait=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve donation gauges over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Render processes (default: all cores)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Renders allowed in flight before shedding load (default: 4 per worker)")
+    parser.add_argument("--max-age", type=int, default=300, help="Cache-Control max-age in seconds")
+    parser.add_argument("--cache-dir", default=os.environ.get("GAUGE_CACHE_DIR"),
+                        help="Directory for the on-disk chart cache, shared between servers on this host")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help="In-memory chart cache size in MiB")
+    parser.add_argument("--cache-disk-mb", type=float,
+                        default=float(os.environ.get("GAUGE_CACHE_DISK_MB", DEFAULT_MAX_DISK_BYTES / 1024 / 1024)),
+                        help="Size limit of the on-disk chart cache in MiB; oldest files are pruned first")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = GaugeServer((args.host, args.port), args.workers, args.max_pending,
+                         max_age=args.max_age, verbose=args.verbose,
+                         cache=ChartCache(int(args.cache_mb * 1024 * 1024), args.cache_dir,
+                                          int(args.cache_disk_mb * 1024 * 1024)))
+    print(f"Serving gauges on http://{args.host}:{args.port}/gauge.png"
+          "?project=...&donated=...&target=...", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import textwrap
+from collections import namedtuple
+from datetime import date
+
+from ChartCache import chart_key
+
+GaugeStyle = namedtuple('GaugeStyle', [
+    'needle',           # 'wedge': tapered needle, rounded base and ringed hub; 'line': thin line, plain hub
+    'money_format',     # format spec for the dollar amounts
+    'percent_format',   # format spec for the progress label, None shows the rounded whole percentage
+    'label_y',          # donated / target labels
+    'label_size',
+    'progress_y',
+    'progress_size',
+    'title_size',
+    'title_width',      # characters per title line, None keeps the title on one line
+    'bundled_font',     # GaugeFonts face; False uses matplotlib's default bold
+    'summary',          # "$x out of $y, donated as of <month>" lines under the gauge
+])
+
+# classic is DonationChart.py's layout, dated the one of DonationChart.y.py
+STYLES = {
+    'classic': GaugeStyle('wedge', ',', None, -0.19, 15, -0.4, 26, 30, 20, True, False),
+    'dated': GaugeStyle('line', ',.2f', '.2f', -0.15, 14, -0.25, 14, 16, None, False, True),
+}
+DEFAULT_STYLE = 'classic'
+
+LINE_PIVOT_RADIUS = 0.05
+SUMMARY_Y = -0.35
+SUMMARY_STEP = 0.1
+
+
+def get_style(name):
+    try:
+        return STYLES[name]
+    except KeyError:
+        raise ValueError(f"unknown gauge style {name!r}, expected one of {', '.join(STYLES)}") from None
+
+
+class GaugeSpec(namedtuple('GaugeSpec', ['project_name', 'donated_amount', 'target_amount', 'style', 'as_of'])):
+    # Everything that decides what one chart looks like. Specs are plain
+    # tuples of strings and numbers, so they hash, compare and pickle
+    # cheaply: caches and the render queue key on them and worker
+    # processes receive them as is. as_of is the month shown by styles
+    # with a summary, fixed when the spec is made.
+
+    __slots__ = ()
+
+    def __new__(cls, project_name, donated_amount, target_amount, style=DEFAULT_STYLE, as_of=None):
+        if get_style(style).summary and as_of is None:
+            as_of = date.today().strftime("%b, %Y")
+        return super().__new__(cls, project_name, donated_amount, target_amount, style, as_of)
+
+    @property
+    def preset(self):
+        return STYLES[self.style]
+
+    def key(self, kind, dpi=300):
+        # Classic keys match chart_key's, so existing cache entries stay valid
+        if self.style != DEFAULT_STYLE:
+            kind = f"{kind}|{self.style}|{self.as_of or ''}"
+        return chart_key(kind, self.project_name, self.donated_amount, self.target_amount, dpi)
+
+def style_font(style, size):
+    # Text keyword arguments for the style at one font size
+    if style.bundled_font:
+        from GaugeFonts import text_style
+        return text_style(size)
+    return {'fontsize': size, 'fontweight': 'bold'}
+
+def money_text(style, amount):
+    return f'${format(amount, style.money_format)}'
+
+def progress_text(style, geometry):
+    if style.percent_format is None:
+        return f'Progress: {geometry.progress_label}%'
+    return f'Progress: {format(float(geometry.actual_percentage) * 100, style.percent_format)}%'
+
+def summary_lines(spec):
+    # Lines under the gauge of a style with a summary, see summary_sizes
+    style = spec.preset
+    return [money_text(style, spec.donated_amount), 'out of', money_text(style, spec.target_amount),
+            f'Donated as of {spec.as_of}']
+
+def summary_sizes(style):
+    return [style.label_size] * 3 + [style.label_size - 2]
+
+def title_text(style, project_name):
+    if style.title_width:
+        return textwrap.fill(project_name, width=style.title_width)
+    return project_name
+
+def title_kwargs(style):
+    # Wrapped titles are centred on their block of lines
+    kwargs = {'pad': 20, 'ha': 'center', **style_font(style, style.title_size)}
+    if style.title_width:
+        kwargs.update(va='center', multialignment='center')
+    return kwargs
+
+def spec_figure(spec, geometry=None):
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle, Polygon
+    from GaugeGeometry import INNER_RADIUS, PIVOT_RADIUS, single_geometry
+
+    style = spec.preset
+    project_name, donated_amount, target_amount = spec[:3]
+
+    # Figures are created outside pyplot so nothing keeps them alive once
+    # the caller drops them
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(aspect='equal')
+
+    if geometry is None:
+        geometry = single_geometry(donated_amount, target_amount)
+
+    # Gauge background (red arc) and progress (green arc)
+    ax.plot(*geometry.background.T, color='red', lw=30)
+    ax.plot(*geometry.progress.T, color='green', lw=30)
+
+    if style.needle == 'wedge':
+        ax.add_patch(Polygon(geometry.needle, closed=True, color='black', zorder=3))
+        ax.add_artist(Circle((0, 0), PIVOT_RADIUS, color='black', zorder=5))
+        ax.add_artist(Circle((0, 0), INNER_RADIUS, color='white', zorder=6))
+        ax.plot(*geometry.base.T, color='black', lw=2, zorder=4)
+    else:
+        # Unit-length line along the (clamped) progress end
+        angle = np.radians(geometry.progress_end_angle)
+        ax.plot([0, np.cos(angle)], [0, np.sin(angle)], color='black', lw=2)
+        ax.add_artist(Circle((0, 0), LINE_PIVOT_RADIUS, color='black', zorder=5))
+
+    label_style = style_font(style, style.label_size)
+    ax.text(-1, style.label_y, f'Donated: {money_text(style, donated_amount)}', horizontalalignment='center',
+            color='black', **label_style)
+    ax.text(1, style.label_y, f'Target: {money_text(style, target_amount)}', horizontalalignment='center',
+            color='black', **label_style)
+    ax.text(0, style.progress_y, progress_text(style, geometry), horizontalalignment='center', color='black',
+            **style_font(style, style.progress_size))
+
+    if style.summary:
+        for index, (text, size) in enumerate(zip(summary_lines(spec), summary_sizes(style))):
+            ax.text(0, SUMMARY_Y - index * SUMMARY_STEP, text, horizontalalignment='center', color='black',
+                    **style_font(style, size))
+
+    ax.set_title(title_text(style, project_name), **title_kwargs(style))
+
+    ax.set_xlim(-1.2, 1.2)
+    ax.set_ylim(-1.2, 1.2)
+    ax.axis('off')
+
+    return fig
@@ -0,0 +1,126 @@
+import argparse
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+
+from ChartCache import ChartCache
+from GaugeGeometry import single_geometry
+from GaugeRaster import GaugeCanvas, draw_labels, draw_shapes
+
+# The arcs and needle clamp at 100%, so the shape layer has a small
+# number of distinct states: one per 0.5% step, plus the two needle
+# special cases (nothing donated, exactly half)
+SPRITE_STEPS = 200
+SPECIAL_KEYS = ("zero", "half")
+
+# Data-space box holding the arcs (with their projecting caps), the
+# needle and the pivot
+LAYER_BOX = (-1.1, -0.1, 1.1, 1.1)
+
+# Sprites are full-resolution RGBA crops: about 6.3 MB each at 300 dpi and
+# 1.2 MB at 133 dpi, so the default budget keeps every step of the web
+# profile but only the busiest ~40 steps at print resolution
+DEFAULT_SPRITE_MB = 256
+_sprites = ChartCache(int(float(os.environ.get("GAUGE_SPRITE_MB", DEFAULT_SPRITE_MB)) * 1024 * 1024))
+
+def sprite_key(geometry):
+    if geometry.actual_percentage == 0:
+        return "zero"
+    if geometry.actual_percentage == 0.5:
+        return "half"
+    return int(round(float(geometry.visual_percentage) * SPRITE_STEPS))
+
+def _sprite_geometry(key):
+    if key == "zero":
+        return single_geometry(0, 1)
+    if key == "half":
+        return single_geometry(0.5, 1)
+    # Nudge off the special cases so step 0 and step 100 keep the
+    # ordinary needle offset
+    fraction = key / SPRITE_STEPS
+    if fraction in (0, 0.5):
+        fraction += 1e-9
+    return single_geometry(fraction, 1)
+
+@lru_cache(maxsize=None)
+def layer_window(dpi):
+    # (top, left, height, width) of the shape layer in canvas pixels
+    (top, left), xs, ys = GaugeCanvas(dpi)._window(*LAYER_BOX)
+    return top, left, ys.shape[0], xs.shape[1]
+
+def render_sprite(key, dpi):
+    canvas = GaugeCanvas(dpi)
+    draw_shapes(canvas, _sprite_geometry(key))
+    top, left, height, width = layer_window(dpi)
+    return np.ascontiguousarray(canvas.pixels[top:top + height, left:left + width])
+
+def sprite(key, dpi):
+    cache_key = f"{dpi}|{key}"
+    data = _sprites.get(cache_key)
+    if data is None:
+        data = render_sprite(key, dpi).tobytes()
+        _sprites.put(cache_key, data)
+    _, _, height, width = layer_window(dpi)
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4)
+
+def prerender(dpi=300, keys=None):
+    # Fill the sprite cache up front, e.g. while a server starts; keys
+    # default to every state, as many as the budget holds
+    if keys is None:
+        keys = list(SPECIAL_KEYS) + list(range(SPRITE_STEPS + 1))
+    for key in keys:
+        sprite(key, dpi)
+    return _sprites.stats()
+
+def sprite_stats():
+    return _sprites.stats()
+
+def draw_gauge(project_name, donated_amount, target_amount, dpi=300, geometry=None):
+    # Like GaugeRaster.draw_gauge, with the shape layer copied from the
+    # nearest 0.5% sprite; labels still show the exact amounts
+    if geometry is None:
+        geometry = single_geometry(donated_amount, target_amount)
+    canvas = GaugeCanvas(dpi)
+    top, left, height, width = layer_window(dpi)
+    canvas.pixels[top:top + height, left:left + width] = sprite(sprite_key(geometry), dpi)
+    draw_labels(canvas, project_name, donated_amount, target_amount, geometry)
+    return canvas
+
+def gauge_png(project_name, donated_amount, target_amount, dpi=300, compress_level=1, geometry=None):
+    canvas = draw_gauge(project_name, donated_amount, target_amount, dpi, geometry)
+    return BytesIO(canvas.png(compress_level))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sprite compositing with a full raster draw.")
+    parser.add_argument("-n", "--charts", type=int, default=50)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--prerender", action="store_true", help="Render every sprite before timing")
+    args = parser.parse_args(argv)
+
+    import GaugeRaster
+
+    rng = random.Random(0)
+    cases = [(f"Project {i}", rng.randint(0, 1500), 1000) for i in range(args.charts)]
+    if args.prerender:
+        start = time.perf_counter()
+        stats = prerender(args.dpi)
+        print(f"prerendered {stats['entries']} sprites ({stats['bytes'] / 2 ** 20:.0f} MiB) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    for name, draw in (("raster", GaugeRaster.draw_gauge), ("sprites", draw_gauge)):
+        start = time.perf_counter()
+        for case in cases:
+            draw(*case, dpi=args.dpi)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / len(cases) * 1000:.1f} ms per chart (draw only)")
+    stats = sprite_stats()
+    print(f"sprite cache: {stats['memory_hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
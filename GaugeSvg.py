@@ -0,0 +1,70 @@
+import math
+import textwrap
+from xml.sax.saxutils import escape
+
+from GaugeGeometry import (BASE_RADIUS, CENTER_X, CENTER_Y, HEIGHT, INNER_RADIUS, PIVOT_RADIUS,
+                           SCALE, START_ANGLE, TITLE_SIZE, WIDTH, single_geometry, title_layout)
+
+FONT = 'font-family="Garamond, serif" font-weight="bold"'
+
+def _num(value):
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+def _xy(x, y):
+    return f"{_num(CENTER_X + SCALE * x)} {_num(CENTER_Y - SCALE * y)}"
+
+def _point(radius, angle):
+    radians = math.radians(angle)
+    return _xy(radius * math.cos(radians), radius * math.sin(radians))
+
+def _arc(radius, start_angle, end_angle, color, width):
+    # Clockwise on screen when the angle decreases
+    sweep = 1 if end_angle < start_angle else 0
+    r = _num(SCALE * radius)
+    return (f'<path d="M {_point(radius, start_angle)} A {r} {r} 0 0 {sweep} '
+            f'{_point(radius, end_angle)}" fill="none" stroke="{color}" '
+            f'stroke-width="{width}" stroke-linecap="square"/>')
+
+def _text(x, y, text, size):
+    return (f'<text x="{_num(CENTER_X + SCALE * x)}" y="{_num(CENTER_Y - SCALE * y)}" '
+            f'text-anchor="middle" font-size="{size}" {FONT}>{escape(text)}</text>')
+
+def gauge_svg(project_name, donated_amount, target_amount, geometry=None):
+    if geometry is None:
+        geometry = single_geometry(donated_amount, target_amount)
+    needle_angle = float(geometry.needle_angle)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}pt" height="{HEIGHT}pt" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}">',
+        _arc(1, START_ANGLE, START_ANGLE - 180, "red", 30),
+    ]
+    if geometry.visual_percentage > 0:
+        parts.append(_arc(1, START_ANGLE, float(geometry.progress_end_angle), "green", 30))
+
+    needle = " ".join(_xy(x, y) for x, y in geometry.needle)
+    parts.append(f'<polygon points="{needle}" fill="black"/>')
+    parts.append(_arc(BASE_RADIUS, needle_angle - 90, needle_angle + 90, "black", 2))
+
+    # Pivot
+    center = f'cx="{_num(CENTER_X)}" cy="{_num(CENTER_Y)}"'
+    parts.append(f'<circle {center} r="{_num(SCALE * PIVOT_RADIUS)}" fill="black"/>')
+    parts.append(f'<circle {center} r="{_num(SCALE * INNER_RADIUS)}" fill="white"/>')
+
+    # Labels
+    parts.append(_text(-1, -0.19, f"Donated: ${donated_amount:,}", 15))
+    parts.append(_text(1, -0.19, f"Target: ${target_amount:,}", 15))
+    parts.append(_text(0, -0.4, f"Progress: {geometry.progress_label}%", 26))
+
+    # Project title, vertically centred like the matplotlib title
+    lines = textwrap.fill(project_name, width=20).split("\n")
+    title = "".join(
+        f'<tspan x="{_num(CENTER_X)}" y="{_num(y)}">{escape(line)}</tspan>'
+        for line, y in zip(lines, title_layout(lines))
+    )
+    parts.append(f'<text text-anchor="middle" dominant-baseline="central" '
+                 f'font-size="{TITLE_SIZE}" {FONT}>{title}</text>')
+
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
@@ -0,0 +1,97 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+class Busy(Exception):
+    # Raised when the render queue stays full for longer than the caller waits
+    pass
+
+
+class RenderScheduler:
+    # Collapses identical in-flight renders into one (single-flight) and
+    # bounds the work admitted at once. At most max_concurrent renders run;
+    # up to max_pending renders may be running or queued, and submitters
+    # beyond that wait up to their timeout and then get Busy. Callers asking
+    # for a key that is already rendering share its Future and never queue.
+
+    def __init__(self, max_concurrent=None, max_pending=None, executor=None):
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_concurrent * 4
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=self.max_concurrent, thread_name_prefix="render")
+        self._inflight = {}
+        self._waiters = {}
+        self._capacity = threading.Condition()
+        self.counters = {"submitted": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0,
+                         "cancelled": 0}
+
+    def submit(self, key, render, *args, timeout=0):
+        with self._capacity:
+            if key in self._inflight:
+                return self._join(key)
+            # Wait for room; another thread may start the same key meanwhile
+            admitted = self._capacity.wait_for(
+                lambda: key in self._inflight or len(self._inflight) < self.max_pending, timeout)
+            if key in self._inflight:
+                return self._join(key)
+            if not admitted:
+                self.counters["rejected"] += 1
+                raise Busy(f"{len(self._inflight)} renders pending")
+            future = self._executor.submit(render, *args)
+            self._inflight[key] = future
+            self._waiters[key] = 1
+            self.counters["submitted"] += 1
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _join(self, key):
+        # Caller holds the lock
+        self._waiters[key] += 1
+        self.counters["coalesced"] += 1
+        return self._inflight[key]
+
+    def cancel(self, key, future):
+        # Drop one caller's interest in a render. The render itself is only
+        # cancelled once nobody else shares it, and only if it has not
+        # started yet; a running matplotlib render cannot be interrupted.
+        with self._capacity:
+            if self._inflight.get(key) is not future:
+                return False
+            self._waiters[key] -= 1
+            if self._waiters[key] > 0:
+                return False
+        return future.cancel()
+
+    def run(self, key, render, *args, timeout=0, render_timeout=None):
+        return self.submit(key, render, *args, timeout=timeout).result(render_timeout)
+
+    def _finished(self, key, future):
+        with self._capacity:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                del self._waiters[key]
+            if future.cancelled():
+                self.counters["cancelled"] += 1
+            elif future.exception() is not None:
+                self.counters["failed"] += 1
+            else:
+                self.counters["completed"] += 1
+            self._capacity.notify_all()
+
+    def stats(self):
+        with self._capacity:
+            return {**self.counters, "pending": len(self._inflight),
+                    "max_concurrent": self.max_concurrent, "max_pending": self.max_pending}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+@lru_cache(maxsize=None)
+def shared_scheduler():
+    # One scheduler per process, so every Streamlit session shares it.
+    # GAUGE_RENDER_THREADS and GAUGE_RENDER_QUEUE override the limits.
+    threads = int(os.environ.get("GAUGE_RENDER_THREADS", 0)) or None
+    queue = int(os.environ.get("GAUGE_RENDER_QUEUE", 0)) or None
+    return RenderScheduler(threads, queue)
@@ -0,0 +1,127 @@
+import io
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+# Instrumentation is off until configure() installs at least one sink, and
+# then costs one perf_counter pair per stage. Traces are per thread;
+# allocation counters come from tracemalloc, which is process-wide, so with
+# concurrent renders they include other threads' allocations.
+_sinks = []
+_options = {"allocations": False, "profile": False, "profile_lines": 25}
+_local = threading.local()
+
+
+def configure(sinks=(), allocations=False, profile=False, profile_lines=25):
+    _sinks[:] = list(sinks)
+    _options.update(allocations=allocations, profile=profile, profile_lines=profile_lines)
+    if allocations and _sinks and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def add_sink(sink):
+    if sink not in _sinks:
+        _sinks.append(sink)
+
+def enabled():
+    return bool(_sinks)
+
+@contextmanager
+def render_trace(label, **info):
+    # Nested traces fold into the outermost one
+    if not _sinks or getattr(_local, "trace", None) is not None:
+        yield getattr(_local, "trace", None)
+        return
+
+    trace = {"label": label, "timestamp": time.time(), **info, "stages": []}
+    profiler = None
+    if _options["profile"]:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    _local.trace = trace
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace["total_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        _local.trace = None
+        if profiler is not None:
+            profiler.disable()
+            trace["profile"] = _profile_text(profiler)
+        for sink in list(_sinks):
+            sink.emit(trace)
+
+@contextmanager
+def stage(name):
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        yield
+        return
+
+    track_allocations = _options["allocations"] and tracemalloc.is_tracing()
+    if track_allocations:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = {"stage": name, "ms": round((time.perf_counter() - start) * 1000, 3)}
+        if track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            record["alloc_kib"] = round((current - before) / 1024, 1)
+            record["peak_kib"] = round((peak - before) / 1024, 1)
+        trace["stages"].append(record)
+
+def _profile_text(profiler):
+    import pstats
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats("cumulative").print_stats(_options["profile_lines"])
+    return output.getvalue()
+
+def summary(trace):
+    stages = ", ".join(f"{record['stage']} {record['ms']:.1f} ms" for record in trace["stages"])
+    return f"{trace['label']}: {trace['total_ms']:.1f} ms ({stages})"
+
+
+class LoggingSink:
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger("DonationChart.render")
+        self.level = level
+
+    def emit(self, trace):
+        self.logger.log(self.level, "%s", summary(trace))
+
+
+class JsonLinesSink:
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, trace):
+        line = json.dumps(trace, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class RingBufferSink:
+
+    def __init__(self, size=50):
+        self._traces = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def emit(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def records(self):
+        with self._lock:
+            return list(self._traces)
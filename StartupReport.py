@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Each stage runs in a fresh interpreter so nothing is already imported
+STAGES = {
+    "import_module": "import DonationChart",
+    "first_render": (
+        "import DonationChart\n"
+        "DonationChart.render_gauge_png('Startup', 1, 2)"
+    ),
+    "import_streamlit": "import streamlit",
+}
+
+def _measure(code):
+    wrapped = (
+        "import time\n"
+        "_start = time.perf_counter()\n"
+        f"{code}\n"
+        "print(time.perf_counter() - _start)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", wrapped],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    seconds = float(result.stdout.strip().splitlines()[-1])
+    return seconds, _parse_importtime(result.stderr)
+
+def _parse_importtime(stderr):
+    # Lines look like "import time:       self [us] |  cumulative | package"
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return imports
+
+def startup_report(top=10):
+    report = {"python": sys.version.split()[0], "stages": {}}
+    for stage, code in STAGES.items():
+        seconds, imports = _measure(code)
+        # Top-level packages only, nested imports are already in the totals
+        top_level = [item for item in imports if item["depth"] == 0]
+        heaviest = sorted(top_level, key=lambda item: item["cumulative_ms"], reverse=True)
+        report["stages"][stage] = {
+            "wall_ms": round(seconds * 1000, 1),
+            "modules_imported": len(imports),
+            "heaviest_imports": heaviest[:top],
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure DonationChart cold-start cost.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest imports to list")
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="Exit non-zero if importing DonationChart takes longer than this")
+    args = parser.parse_args(argv)
+
+    report = startup_report(args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for stage, result in report["stages"].items():
+            print(f"{stage}: {result['wall_ms']:.1f} ms, {result['modules_imported']} modules")
+            for item in result["heaviest_imports"]:
+                print(f"    {item['cumulative_ms']:9.1f} ms  {item['module']}")
+
+    import_ms = report["stages"]["import_module"]["wall_ms"]
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"Importing DonationChart took {import_ms:.1f} ms (limit {args.max_import_ms} ms)",
+              file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import gc
+import os
+
+from matplotlib.figure import Figure
+
+from ChartProfiles import OutputProfile
+from DonationChart import render_gauge_png
+
+# GAUGE_MEMORY_RENDERS lowers the count for a quick local run
+RENDERS = int(os.environ.get("GAUGE_MEMORY_RENDERS", 10_000))
+WARM_UP = 100
+
+# Tiny rasters keep 10,000 renders to a few minutes; every render still
+# creates, draws and disposes a full figure
+PROFILE = OutputProfile('png', 10, None, None, 1, False, None)
+
+# Allowed growth after warm-up: allocator noise, not a figure per render
+MAX_RSS_GROWTH = 20 * 1024 * 1024
+MAX_OBJECT_GROWTH = 1000
+
+
+def _render(index):
+    # Labels repeat every WARM_UP renders, so matplotlib's bounded text
+    # caches are already full when measuring starts
+    index %= WARM_UP
+    return render_gauge_png(f"Project {index}", index * 37, 1000 + index, profile=PROFILE)
+
+def _rss():
+    # Resident set size in bytes where /proc exists, else None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError, ValueError):
+        return None
+
+def _live_figures():
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+def test_memory_stays_flat_over_many_renders():
+    for index in range(WARM_UP):
+        _render(index)
+    gc.collect()
+    rss_before = _rss()
+    objects_before = len(gc.get_objects())
+
+    for index in range(RENDERS):
+        assert _render(index).getvalue().startswith(b"\x89PNG")
+
+    gc.collect()
+    assert _live_figures() == 0
+    assert len(gc.get_objects()) - objects_before < MAX_OBJECT_GROWTH
+    if rss_before is not None:
+        assert _rss() - rss_before < MAX_RSS_GROWTH
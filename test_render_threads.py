@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from DonationChart import render_gauge_rgba
+
+THREADS = 8
+ROUNDS = 4
+DPI = 40
+
+# Distinct names, amounts and needle special cases, so a render picking up
+# another thread's figure, text or font settings would show in the pixels
+CASES = [
+    (f"Project {index} " + "Long Name " * (index % 4), donated, target)
+    for index, (donated, target) in enumerate([
+        (0, 1000), (500, 1000), (2500, 1000), (1, 3), (987_654_321, 1_000_000_000),
+        (1234.5, 5000), (99, 100), (7, 10_000), (42, 42), (3, 7), (150, 200), (10, 20),
+    ])
+]
+
+
+def _render(case):
+    return render_gauge_rgba(*case, dpi=DPI)
+
+def test_thread_pool_renders_match_sequential():
+    expected = [_render(case) for case in CASES]
+
+    jobs = [index for _ in range(ROUNDS) for index in range(len(CASES))]
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(lambda index: (index, _render(CASES[index])), jobs))
+
+    assert len(results) == len(jobs)
+    for index, rgba in results:
+        assert rgba.shape == expected[index].shape
+        assert np.array_equal(rgba, expected[index]), f"thread render differs for {CASES[index][0]!r}"